@@ -2,9 +2,45 @@ __author__ = "Pavel Maksimov"
 __email__ = "vur21@ya.ru"
 __version__ = "1.1.0"
 
+import importlib
+
 from .adapters import (
     generate_wrapper_from_adapter,
     TAPIAdapter,
     BaseTAPIAdapter,
     JSONAdapterMixin,
 )
+
+# Optional features, their modules are imported on first access.
+_LAZY_ATTRIBUTES = {
+    "AdaptiveConcurrency": ".concurrency",
+    "AdaptiveTimeout": ".timeouts",
+    "Checkpoint": ".state",
+    "ConcurrencyLimits": ".concurrency",
+    "Hedging": ".hedging",
+    "InMemoryTransport": ".transport",
+    "JSONFileStateStore": ".state",
+    "MemoryStateStore": ".state",
+    "Offloader": ".offload",
+    "RecordingTransport": ".cassette",
+    "ReplayTransport": ".cassette",
+    "RequestLogger": ".request_log",
+    "RequestScheduler": ".scheduling",
+    "ShardedBatchExecutor": ".sharding",
+    "SQLiteCache": ".cache",
+    "SyncClient": ".sync",
+    "Watermark": ".state",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -1,6 +1,5 @@
 import json
 import re
-from aiohttp.client_exceptions import ContentTypeError
 from typing import List
 
 from .exceptions import (
@@ -10,6 +9,7 @@ from .exceptions import (
     NotFound404Error,
 )
 from .serializers import SimpleSerializer
+from .templates import RequestTemplate
 from .tapi import TAPIInstaller, TAPIClientExecutor
 
 
@@ -62,6 +62,9 @@ class BaseTAPIAdapter:
     serializer_class = SimpleSerializer
     api_root = NotImplementedError
     resource_mapping: dict = NotImplementedError
+    offload = None  # Offloader for large request and response bodies
+    pack_max_items = None  # rows per request of a packed batch
+    pack_max_bytes = None  # encoded rows size per request of a packed batch
 
     def __init__(
         self, serializer_class=None, resource_mapping: List[Resource] = None, **kwargs
@@ -138,8 +141,22 @@ class BaseTAPIAdapter:
                 )
             )
 
-    def get_request_kwargs(self, api_params, *args, **kwargs):
+    def get_request_template(self, api_params, resource_name):
+        """
+        Parts of the requests to a resource that only depend on `api_params`:
+        the resource url, static headers and default query params.
+        """
+        url = None
+        if resource_name is not None and resource_name in self.resource_mapping:
+            api_root = self.get_api_root(api_params, resource_name=resource_name)
+            resource = self.resource_mapping[resource_name]["resource"]
+            url = api_root.rstrip("/") + "/" + resource.lstrip("/")
+        return RequestTemplate(url=url, params=api_params.get("default_params"))
+
+    def get_request_kwargs(self, api_params, *args, template=None, **kwargs):
         """Adding parameters to a request"""
+        if template is not None:
+            template.apply(kwargs)
         serialized = self.serialize_data(kwargs.get("data"))
         kwargs["data"] = self.format_data_to_request(serialized)
         return kwargs
@@ -191,6 +208,9 @@ class BaseTAPIAdapter:
     def response_to_native(self, response):
         raise NotImplementedError()
 
+    def content_to_native(self, content, encoding="utf-8"):
+        raise NotImplementedError()
+
     def get_iterator_iteritems(
         self, response_data, response, request_kwargs, api_params, **kwargs
     ):
@@ -209,6 +229,36 @@ class BaseTAPIAdapter:
     ):
         raise NotImplementedError()
 
+    def build_pack_envelope(self, rows, **kwargs):
+        """Request body carrying several rows of a packed batch."""
+        return rows
+
+    def split_pack_response(self, response_data, rows, **kwargs):
+        """Per-row results of a packed request, in the order of `rows`."""
+        if isinstance(response_data, list) and len(response_data) == len(rows):
+            return response_data
+        raise ValueError(
+            "Cannot split the response of a packed request of {} rows, "
+            "override split_pack_response".format(len(rows))
+        )
+
+    def get_watermark_request_kwargs(
+        self, watermark, request_kwargs, api_params, **kwargs
+    ):
+        """
+        Request kwargs that fetch only the items changed since `watermark`,
+        e.g. {**request_kwargs, "params": {"updated_since": watermark}}.
+        """
+        raise NotImplementedError()
+
+    def get_item_watermark(self, item, **kwargs):
+        """Watermark of an item, None if the item has none."""
+        raise NotImplementedError()
+
+    def merge_watermarks(self, current, new):
+        """Watermark covering both marks."""
+        return max(current, new)
+
     def is_authentication_expired(self, tapi_exception, *args, **kwargs):
         return False
 
@@ -231,6 +281,16 @@ class BaseTAPIAdapter:
         """
         return False
 
+    def _needs_error_message(self, can_refresh=False):
+        """Whether an overridden error hook receives the message of an error."""
+        hooks = ["retry_request", "error_handling"]
+        if can_refresh:
+            hooks.append("is_authentication_expired")
+        cls = type(self)
+        return any(
+            getattr(cls, name) is not getattr(BaseTAPIAdapter, name) for name in hooks
+        )
+
     def __str__(self, data=None, request_kwargs=None, response=None, api_params=None):
         raise NotImplementedError()
 
@@ -251,30 +311,67 @@ class JSONAdapterMixin:
         attributes.extend(a)
         return attributes
 
-    def get_request_kwargs(self, api_params, *args, **kwargs):
-        request_kwargs = super().get_request_kwargs(api_params, *args, **kwargs)
-        request_kwargs["headers"] = {
-            "Content-Type": "application/json",
-            **api_params.get("headers", {}),
-            **request_kwargs.get("headers", {}),
-        }
+    def get_request_template(self, api_params, resource_name):
+        template = super().get_request_template(api_params, resource_name)
+        return RequestTemplate(
+            url=template.url,
+            headers={
+                "Content-Type": "application/json",
+                **template.headers,
+                **api_params.get("headers", {}),
+            },
+            params=template.params,
+        )
+
+    def get_request_kwargs(self, api_params, *args, template=None, **kwargs):
+        request_kwargs = super().get_request_kwargs(
+            api_params, *args, template=template, **kwargs
+        )
+        if template is None:
+            request_kwargs["headers"] = {
+                "Content-Type": "application/json",
+                **api_params.get("headers", {}),
+                **request_kwargs.get("headers", {}),
+            }
         return request_kwargs
 
     def format_data_to_request(self, data):
         if data:
+            if self.offload is not None:
+                return self.offload.encode(json.dumps, data)
             return json.dumps(data)
 
+    def content_to_native(self, content, encoding="utf-8"):
+        """Decode raw response body."""
+        text = content.decode(encoding)
+        if not text.strip():
+            return None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+
     async def response_to_native(self, response):
+        if self.offload is not None:
+            content = await response.read()
+            encoding = response.get_encoding() if content else "utf-8"
+            return await self.offload.decode(self.content_to_native, content, encoding)
+
         try:
             return await response.json()
-        except ContentTypeError:
+        except json.JSONDecodeError:
+            return await response.text()
+        except Exception as error:
+            # aiohttp is imported here, not at module load, to keep the import cheap.
+            from aiohttp.client_exceptions import ContentTypeError
+
+            if not isinstance(error, ContentTypeError):
+                raise
             text = await response.text()
             try:
                 return json.loads(text)
             except json.JSONDecodeError:
                 return text
-        except json.JSONDecodeError:
-            return await response.text()
 
     async def get_error_message(self, data, response=None):
         if not data and response:
@@ -0,0 +1,79 @@
+"""
+Results of batch calls.
+
+    result = await client.users().post_batch(data=rows, concurrency=20)
+    result.stats  # requests, succeeded, errors, elapsed
+    result = await result.retry_failed()
+    result.raise_for_errors()
+
+A failed row does not fail the batch: its position holds the exception
+and the rest of the rows keep their responses.
+"""
+
+
+class BatchResult(list):
+    """
+    Responses of a batch in the order of its rows. A failed row holds its
+    exception instead, `errors` maps row indexes to those exceptions and
+    `timings` has the seconds every row took.
+    """
+
+    def __init__(self, results, timings, elapsed, rows=None, resend=None):
+        super().__init__(results)
+        self.timings = timings
+        self.elapsed = elapsed
+        self.errors = {
+            index: result
+            for index, result in enumerate(results)
+            if isinstance(result, Exception)
+        }
+        self._rows = rows
+        self._resend = resend
+
+    @property
+    def succeeded(self):
+        return len(self) - len(self.errors)
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+    @property
+    def stats(self):
+        return {
+            "requests": len(self),
+            "succeeded": self.succeeded,
+            "errors": self.failed,
+            "elapsed": self.elapsed,
+        }
+
+    def raise_for_errors(self):
+        """Raise the exception of the first failed row, if any."""
+        for index in sorted(self.errors):
+            raise self.errors[index]
+
+    async def retry_failed(self):
+        """
+        Send the failed rows again, with the method, params and concurrency
+        of the original call. Returns a new result where the retried rows
+        replace the failed ones.
+        """
+        if not self.errors:
+            return self
+        if self._resend is None:
+            raise TypeError("This batch result cannot be retried")
+
+        indexes = sorted(self.errors)
+        retried = await self._resend([self._rows[index] for index in indexes])
+
+        results, timings = list(self), list(self.timings)
+        for index, result, timing in zip(indexes, retried, retried.timings):
+            results[index] = result
+            timings[index] = timing
+        return BatchResult(
+            results,
+            timings,
+            self.elapsed + retried.elapsed,
+            rows=self._rows,
+            resend=self._resend,
+        )
@@ -0,0 +1,337 @@
+"""
+End-to-end load generator.
+
+Drives a client built with `generate_wrapper_from_adapter` against a local
+aiohttp stub server and reports throughput and latency percentiles.
+
+Usage:
+    python -m async_tapi.bench [module:Client] --scenario get --concurrency 50
+    python -m async_tapi.bench --serve --port 8080
+    python -m async_tapi.bench --url http://127.0.0.1:8080 --scenario iter_items
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import random
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+from .adapters import TAPIAdapter, generate_wrapper_from_adapter
+from .exceptions import TAPIException
+from .tapi import TAPIInstaller
+
+SCENARIOS = ("get", "post_batch", "iter_items")
+
+
+class BenchClientAdapter(TAPIAdapter):
+    api_root = "http://127.0.0.1"
+    resource_mapping = {}
+
+
+BenchClient = generate_wrapper_from_adapter(BenchClientAdapter)
+
+
+class StubServer:
+    """
+    Local upstream with configurable latency, error rate,
+    page count and payload size.
+    """
+
+    def __init__(
+        self, latency=0.0, error_rate=0.0, pages=10, page_size=10, payload_size=100
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.pages = pages
+        self.page_size = page_size
+        self.payload = "x" * payload_size
+        self.requests = 0
+        self._runner = None
+        self.url = None
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_get("/item", self.item)
+        app.router.add_get("/items", self.items)
+        app.router.add_route("*", "/items", self.write)
+        return app
+
+    async def _respond(self, data):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            return web.json_response({"error": "stub error"}, status=500)
+        return web.json_response(data)
+
+    async def item(self, request):
+        return await self._respond({"data": {"id": 1, "payload": self.payload}})
+
+    async def items(self, request):
+        page = int(request.query.get("page", 1))
+        next_url = ""
+        if page < self.pages:
+            next_url = self.url + str(request.rel_url.with_query(page=page + 1))
+        data = [
+            {"id": (page - 1) * self.page_size + i, "payload": self.payload}
+            for i in range(self.page_size)
+        ]
+        return await self._respond({"data": data, "paging": {"next": next_url}})
+
+    async def write(self, request):
+        await request.read()
+        return await self._respond({"data": {"ok": True}})
+
+    async def start(self, host="127.0.0.1", port=0):
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = "http://{}:{}".format(host, port)
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def bench_wrapper(wrapper, base_url):
+    """
+    Subclass the wrapper's adapter so that it talks to the stub server.
+    Serialization, request building and response processing stay the
+    adapter's own; url routing and pagination follow the stub's format.
+    """
+
+    class StubAdapter(wrapper.adapter_class):
+        api_root = base_url
+        resource_mapping = {
+            "bench_item": {"resource": "item"},
+            "bench_items": {"resource": "items"},
+        }
+
+        def get_api_root(self, api_params, resource_name):
+            return base_url
+
+        def get_iterator_iteritems(self, response_data, **kwargs):
+            return response_data["data"]
+
+        def get_iterator_pages(self, response_data, **kwargs):
+            return response_data["data"]
+
+        def get_iterator_next_request_kwargs(self, response_data, **kwargs):
+            url = response_data.get("paging", {}).get("next")
+            if url:
+                return {"url": url}
+
+    StubAdapter.__name__ = "Stub" + wrapper.adapter_class.__name__
+    return TAPIInstaller(StubAdapter)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    index = max(math.ceil(q / 100 * len(values)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class Recorder:
+    """Collects per-request latencies through aiohttp tracing."""
+
+    def __init__(self):
+        self.latencies = []
+
+    def trace_config(self):
+        async def on_start(session, context, params):
+            context.start = time.perf_counter()
+
+        async def on_end(session, context, params):
+            self.latencies.append(time.perf_counter() - context.start)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_start)
+        trace_config.on_request_end.append(on_end)
+        return trace_config
+
+
+async def _scenario_get(client, requests, concurrency, **kwargs):
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in counter:
+            try:
+                await client.bench_item().get()
+            except TAPIException:
+                errors += 1
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return errors
+
+
+async def _scenario_post_batch(client, requests, concurrency, **kwargs):
+    rows = [{"id": i, "payload": kwargs["payload"]} for i in range(requests)]
+    result = await client.bench_items().post_batch(data=rows, concurrency=concurrency)
+    return result.failed
+
+
+async def _scenario_iter_items(client, requests, concurrency, **kwargs):
+    errors = 0
+
+    async def walk():
+        nonlocal errors
+        try:
+            response = await client.bench_items().get()
+            async for _ in response().iter_items():
+                pass
+        except TAPIException:
+            errors += 1
+
+    await asyncio.gather(*[walk() for _ in range(concurrency)])
+    return errors
+
+
+async def run_scenario(
+    wrapper,
+    url,
+    scenario,
+    requests=1000,
+    concurrency=10,
+    payload_size=100,
+    params=None,
+):
+    recorder = Recorder()
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    session = aiohttp.ClientSession(
+        connector=connector, trace_configs=[recorder.trace_config()]
+    )
+    runner = globals()["_scenario_" + scenario]
+    async with bench_wrapper(wrapper, url)(session=session, **(params or {})) as client:
+        start = time.perf_counter()
+        errors = await runner(client, requests, concurrency, payload="x" * payload_size)
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(recorder.latencies)
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed": round(elapsed, 4),
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def run(wrapper, scenarios, url=None, server_options=None, **kwargs):
+    server = None
+    if url is None:
+        server = StubServer(**(server_options or {}))
+        url = await server.start()
+    try:
+        return [
+            await run_scenario(wrapper, url, scenario, **kwargs)
+            for scenario in scenarios
+        ]
+    finally:
+        if server is not None:
+            await server.stop()
+
+
+def load_wrapper(path):
+    """Import a wrapper given as 'package.module:Client'."""
+    module_name, _, attr = path.partition(":")
+    wrapper = getattr(importlib.import_module(module_name), attr or "Client")
+    if not isinstance(wrapper, TAPIInstaller):
+        raise TypeError(
+            "{} is not a wrapper built with generate_wrapper_from_adapter".format(path)
+        )
+    return wrapper
+
+
+async def serve(host, port, **server_options):
+    server = StubServer(**server_options)
+    url = await server.start(host, port)
+    print("Stub server listening on {}".format(url))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def _parse_params(pairs):
+    return dict(pair.split("=", 1) for pair in pairs or [])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m async_tapi.bench")
+    parser.add_argument("wrapper", nargs="?", help="module:Client, default stub client")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--payload-size", type=int, default=100)
+    parser.add_argument("--param", action="append", help="client param key=value")
+    parser.add_argument("--url", help="use an already running stub server")
+    parser.add_argument("--serve", action="store_true", help="only run the server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    server_options = {
+        "latency": args.latency / 1000,
+        "error_rate": args.error_rate,
+        "pages": args.pages,
+        "page_size": args.page_size,
+        "payload_size": args.payload_size,
+    }
+
+    if args.serve:
+        try:
+            asyncio.run(serve(args.host, args.port, **server_options))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    wrapper = load_wrapper(args.wrapper) if args.wrapper else BenchClient
+    reports = asyncio.run(
+        run(
+            wrapper,
+            args.scenario or ["get"],
+            url=args.url,
+            server_options=server_options,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            payload_size=args.payload_size,
+            params=_parse_params(args.param),
+        )
+    )
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print(
+                "{scenario:<11} c={concurrency:<4} requests={requests:<7} "
+                "errors={errors:<5} {throughput:>10} req/s  "
+                "p50={p50_ms}ms p95={p95_ms}ms p99={p99_ms}ms".format(**report)
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
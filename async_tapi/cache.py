@@ -0,0 +1,314 @@
+"""
+Persistent response cache for GET requests.
+
+    cache = SQLiteCache("reference.sqlite", ttl=24 * 3600, max_size=512 * 1024 * 1024)
+    async with MyClient(cache=cache) as client:
+        await client.countries().get()              # network, then disk
+        await client.countries().get()              # disk
+        await client.countries().get(cache=False)   # network, not stored
+
+Entries are keyed on the normalized request (method, url, params, body),
+an optional namespace and the values of its `vary_headers`: clients with
+different credentials or content negotiation never share entries.
+The database runs in WAL mode, so several worker processes can share one
+file: readers do not block each other and writers wait for the lock
+instead of failing. Reads take no write lock: access times are kept in
+memory and written in batches, and the total size is kept up to date by
+triggers instead of being summed on every insert.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from .transport import InMemoryResponse, request_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content_type TEXT,
+    charset TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_created ON responses (created);
+CREATE TABLE IF NOT EXISTS cache_size (total INTEGER NOT NULL);
+INSERT INTO cache_size
+    SELECT COALESCE(SUM(size), 0) FROM responses
+    WHERE NOT EXISTS (SELECT 1 FROM cache_size);
+CREATE TRIGGER IF NOT EXISTS responses_inserted AFTER INSERT ON responses
+    BEGIN UPDATE cache_size SET total = total + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS responses_deleted AFTER DELETE ON responses
+    BEGIN UPDATE cache_size SET total = total - OLD.size; END;
+"""
+
+# Headers whose values are part of the key, credentials first.
+VARY_HEADERS = (
+    "authorization",
+    "proxy-authorization",
+    "cookie",
+    "x-api-key",
+    "accept",
+    "accept-language",
+)
+
+# Pending access times are written once there are this many.
+ACCESS_FLUSH_SIZE = 100
+
+# Least recently used entries fetched per round of an eviction.
+EVICTION_BATCH = 100
+
+
+class SQLiteCache:
+    """
+    Response cache in a SQLite file.
+
+    `ttl` is the lifetime of an entry in seconds, None keeps entries until
+    they are evicted. `max_size` caps the total size of stored bodies in
+    bytes, least recently used entries are evicted first.
+    Requests only share an entry when they have the same `namespace` and
+    the same values of the `vary_headers`, which are hashed into the key.
+    Database calls run in `executor` (the loop's thread pool by default).
+    """
+
+    def __init__(
+        self,
+        path,
+        ttl=None,
+        max_size=None,
+        timeout=30.0,
+        executor=None,
+        vary_headers=VARY_HEADERS,
+        namespace=None,
+    ):
+        self.path = path
+        self.vary_headers = sorted({name.lower() for name in vary_headers})
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_size = max_size
+        self.timeout = timeout
+        self.executor = executor
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._accessed = {}
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        with _Transaction(connection):
+            for statement in _SCHEMA.split(";\n"):
+                if statement.strip():
+                    connection.execute(statement)
+
+    def _connect(self):
+        """Connection of the current thread, sqlite3 connections are not shared."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # REPLACE fires the delete trigger of the replaced row too.
+            connection.execute("PRAGMA recursive_triggers=ON")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _connection(self):
+        return _Transaction(self._connect())
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get_sync(self, key):
+        now = time.time()
+        # A single statement in autocommit mode: a read, no write lock.
+        row = (
+            self._connect()
+            .execute(
+                "SELECT method, url, status, headers, content_type, charset, body,"
+                " created FROM responses WHERE key = ?",
+                (key,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        if self._expired(row[7], now):
+            with self._connection() as connection:
+                connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        with self._lock:
+            self._accessed[key] = now
+            flush = len(self._accessed) >= ACCESS_FLUSH_SIZE
+        if flush:
+            with self._connection() as connection:
+                self._flush_accessed(connection)
+        method, url, status, headers, content_type, charset, body, _ = row
+        return InMemoryResponse(
+            method,
+            url,
+            status=status,
+            body=bytes(body),
+            headers=json.loads(headers),
+            content_type=content_type,
+            charset=charset or "utf-8",
+        )
+
+    def _flush_accessed(self, connection):
+        """Write the access times of the entries read since the last flush."""
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        if accessed:
+            connection.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(when, key) for key, when in accessed.items()],
+            )
+
+    def flush(self):
+        """Write pending access times, they decide the order of evictions."""
+        with self._connection() as connection:
+            self._flush_accessed(connection)
+
+    def set_sync(self, key, method, url, status, headers, content_type, charset, body):
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    method,
+                    url,
+                    status,
+                    json.dumps(headers),
+                    content_type,
+                    charset,
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            if self.ttl is not None:
+                connection.execute(
+                    "DELETE FROM responses WHERE created < ?", (now - self.ttl,)
+                )
+            if self.max_size is not None:
+                self._evict(connection)
+
+    def _evict(self, connection):
+        (total,) = connection.execute("SELECT total FROM cache_size").fetchone()
+        if total <= self.max_size:
+            return
+        self._flush_accessed(connection)
+        while total > self.max_size:
+            rows = connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed LIMIT ?",
+                (EVICTION_BATCH,),
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_size:
+                    break
+                evicted.append((key,))
+                total -= size
+            connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+            self.evictions += len(evicted)
+
+    def clear_sync(self):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def key(self, method, url, params=None, data=None, headers=None):
+        """Key of a request, see `request_key`, with the namespace and vary headers."""
+        headers = {
+            str(name).lower(): str(value) for name, value in (headers or {}).items()
+        }
+        vary = [(name, headers.get(name)) for name in self.vary_headers]
+        raw = json.dumps([self.namespace, request_key(method, url, params, data), vary])
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    async def get(self, key):
+        """Cached response for `key` or None."""
+        response = await self._run(self.get_sync, key)
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    async def set(self, key, response):
+        """Store the body of `response`, which stays readable afterwards."""
+        body = await response.read()
+        await self._run(
+            self.set_sync,
+            key,
+            response.method,
+            str(response.url),
+            response.status,
+            dict(response.headers),
+            response.content_type,
+            response.charset,
+            body,
+        )
+
+    async def clear(self):
+        await self._run(self.clear_sync)
+
+    def close(self):
+        if self._accessed:
+            self.flush()
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class _Transaction:
+    """Write transaction taking the database lock up front (BEGIN IMMEDIATE)."""
+
+    __slots__ = ("connection",)
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.connection.execute("COMMIT")
+        else:
+            self.connection.execute("ROLLBACK")
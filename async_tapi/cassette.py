@@ -0,0 +1,146 @@
+"""
+Record and replay of request/response pairs.
+
+A cassette is an append-only data file of records and an index file
+next to it (`<path>.idx`) with one `key offset length` line per record.
+Replay loads only the index and reads records through mmap, so captures
+larger than memory can be served.
+
+    async with MyClient(session=RecordingTransport(aiohttp.ClientSession(), "prod.cassette")) as client:
+        ...
+
+    async with MyClient(session=ReplayTransport("prod.cassette", timing_scale=1.0)) as client:
+        ...
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+
+from .transport import InMemoryResponse, request_key
+
+_HEADER_SIZE = struct.Struct(">I")
+
+
+class CassetteMiss(LookupError):
+    """Request has no recorded response."""
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+class RecordingTransport:
+    """Pass requests to `transport` and append every exchange to the cassette."""
+
+    def __init__(self, transport, path):
+        self.transport = transport
+        self.path = path
+        self._data = open(path, "ab")
+        self._index = open(index_path(path), "a", encoding="utf8")
+        self.recorded = 0
+
+    async def request(self, method, url, **kwargs):
+        start = time.monotonic()
+        response = await self.transport.request(method, url, **kwargs)
+        body = await response.read()
+        elapsed = time.monotonic() - start
+
+        key = request_key(method, url, kwargs.get("params"), kwargs.get("data"))
+        header = json.dumps(
+            {
+                "key": key,
+                "method": method.upper(),
+                "url": str(url),
+                "status": response.status,
+                "headers": dict(response.headers),
+                "content_type": response.content_type,
+                "charset": response.charset,
+                "elapsed": elapsed,
+            }
+        ).encode()
+
+        offset = self._data.tell()
+        self._data.write(_HEADER_SIZE.pack(len(header)) + header + body)
+        self._data.flush()
+        length = self._data.tell() - offset
+        self._index.write("{} {} {}\n".format(key, offset, length))
+        self._index.flush()
+        self.recorded += 1
+        return response
+
+    async def close(self):
+        self._data.close()
+        self._index.close()
+        await self.transport.close()
+
+
+class ReplayTransport:
+    """
+    Serve recorded responses by request key.
+
+    A key recorded several times is replayed in recording order and then
+    repeats its last response. `timing_scale` None replies immediately,
+    1.0 reproduces the recorded latency, 0.5 halves it.
+    """
+
+    def __init__(self, path, timing_scale=None):
+        self.path = path
+        self.timing_scale = timing_scale
+        self._index = {}
+        self._served = {}
+        self.requests = 0
+        self.misses = 0
+
+        with open(index_path(path), "r", encoding="utf8") as fh:
+            for line in fh:
+                key, offset, length = line.split()
+                self._index.setdefault(key, []).append((int(offset), int(length)))
+
+        self._file = open(path, "rb")
+        self._mmap = None
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return sum(len(records) for records in self._index.values())
+
+    def _read(self, offset, length):
+        (header_length,) = _HEADER_SIZE.unpack_from(self._mmap, offset)
+        start = offset + _HEADER_SIZE.size
+        header = json.loads(self._mmap[start : start + header_length])
+        body = self._mmap[start + header_length : offset + length]
+        return header, body
+
+    async def request(self, method, url, **kwargs):
+        self.requests += 1
+        key = request_key(method, url, kwargs.get("params"), kwargs.get("data"))
+        records = self._index.get(key)
+        if not records:
+            self.misses += 1
+            raise CassetteMiss("No recorded response for {} {}".format(method, url))
+
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        header, body = self._read(*records[min(served, len(records) - 1)])
+
+        if self.timing_scale:
+            await asyncio.sleep(header["elapsed"] * self.timing_scale)
+
+        return InMemoryResponse(
+            header["method"],
+            header["url"],
+            status=header["status"],
+            body=body,
+            headers=header["headers"],
+            content_type=header["content_type"],
+            charset=header["charset"] or "utf-8",
+        )
+
+    async def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
@@ -0,0 +1,292 @@
+import asyncio
+import collections
+import time
+from urllib.parse import urlsplit
+
+
+class ConcurrencyLimiter:
+    """Fixed limit of requests in flight."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters = collections.deque()
+
+    def _has_capacity(self):
+        return self.in_flight < max(int(self.limit), 1)
+
+    def try_acquire(self):
+        """Take a slot without waiting, False when none is free."""
+        if self._waiters or not self._has_capacity():
+            return False
+        self.in_flight += 1
+        return True
+
+    async def acquire(self):
+        if self.try_acquire():
+            return
+
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the cancellation.
+                self._release_slot()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency=None, status=None, error=False):
+        self._release_slot()
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.in_flight += 1
+
+    @property
+    def stats(self):
+        return {"limit": int(self.limit), "in_flight": self.in_flight}
+
+
+class AdaptiveConcurrency(ConcurrencyLimiter):
+    """
+    AIMD controller of requests in flight.
+
+    The limit grows by `increase` per window of `limit` healthy responses
+    and is multiplied by `decrease` on backoff statuses (429, 503 by default),
+    5xx, connection errors or when latency exceeds `spike_factor` times
+    the moving average of healthy latencies (or `latency_threshold` seconds).
+    Only one cut happens per round trip, so a burst of failures of
+    requests sent under the old limit is counted once.
+    """
+
+    def __init__(
+        self,
+        min_limit=1,
+        max_limit=100,
+        initial_limit=None,
+        increase=1.0,
+        decrease=0.5,
+        latency_threshold=None,
+        spike_factor=3.0,
+        backoff_statuses=(429, 503),
+        smoothing=0.1,
+    ):
+        super().__init__(initial_limit or min_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_threshold = latency_threshold
+        self.spike_factor = spike_factor
+        self.backoff_statuses = set(backoff_statuses)
+        self.smoothing = smoothing
+        self.latency_average = None
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+
+    def _is_spike(self, latency):
+        if latency is None:
+            return False
+        if self.latency_threshold is not None:
+            return latency > self.latency_threshold
+        if self.latency_average is None:
+            return False
+        return latency > self.latency_average * self.spike_factor
+
+    def _is_overloaded(self, latency, status, error):
+        if error and status is None:
+            return True
+        if status is not None and (status in self.backoff_statuses or status >= 500):
+            return True
+        return self._is_spike(latency)
+
+    def release(self, latency=None, status=None, error=False):
+        if latency is None and status is None and not error:
+            # Cancelled request, no signal about the upstream.
+            self._release_slot()
+            return
+
+        now = time.monotonic()
+        if self._is_overloaded(latency, status, error):
+            sent_at = now - (latency or 0)
+            if sent_at >= self._last_decrease:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self.decreases += 1
+                self._last_decrease = now
+        else:
+            if latency is not None:
+                if self.latency_average is None:
+                    self.latency_average = latency
+                else:
+                    self.latency_average += self.smoothing * (
+                        latency - self.latency_average
+                    )
+            if self.limit < self.max_limit:
+                self.limit = min(
+                    self.max_limit, self.limit + self.increase / self.limit
+                )
+                self.increases += 1
+        self._release_slot()
+
+    @property
+    def stats(self):
+        return {
+            **super().stats,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "latency_average": self.latency_average,
+        }
+
+
+class SemaphoreLimiter(ConcurrencyLimiter):
+    """Limiter over an `asyncio.Semaphore`, which may be shared with other code."""
+
+    def __init__(self, semaphore):
+        # The free slots when wrapped, only used to size batch workers.
+        super().__init__(getattr(semaphore, "_value", 1))
+        self.semaphore = semaphore
+
+    def try_acquire(self):
+        if self.semaphore.locked():
+            return False
+        # An unlocked semaphore is taken right away, without a waiter.
+        self.semaphore._value -= 1
+        self.in_flight += 1
+        return True
+
+    async def acquire(self):
+        await self.semaphore.acquire()
+        self.in_flight += 1
+
+    def release(self, latency=None, status=None, error=False):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+
+def get_limiter(concurrency):
+    """
+    Limiter from a number, an `asyncio.Semaphore` or an already built
+    limiter, None means unlimited.
+    """
+    if concurrency is None or isinstance(concurrency, ConcurrencyLimiter):
+        return concurrency
+    if isinstance(concurrency, asyncio.Semaphore):
+        return SemaphoreLimiter(concurrency)
+    return ConcurrencyLimiter(concurrency)
+
+
+class _LimitsSlot:
+    """Slots of every limit that applies to one request."""
+
+    def __init__(self, limiters):
+        self.limiters = limiters
+        self.status = None  # set by the client once the response arrives
+        self._acquired = []
+        self._start = None
+
+    def try_acquire(self):
+        """Take every slot without waiting, False (holding none) when one is busy."""
+        for limiter in self.limiters:
+            if not limiter.try_acquire():
+                while self._acquired:
+                    self._acquired.pop().release()
+                return False
+            self._acquired.append(limiter)
+        self._start = time.monotonic()
+        return True
+
+    async def __aenter__(self):
+        if self._start is not None:
+            # Already taken by try_acquire.
+            return self
+        for limiter in self.limiters:
+            try:
+                await limiter.acquire()
+            except BaseException:
+                await self.__aexit__(None, None, None)
+                raise
+            self._acquired.append(limiter)
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        latency = None
+        error = exc_type is not None and not issubclass(
+            exc_type, asyncio.CancelledError
+        )
+        if self.status is not None or error:
+            latency = time.monotonic() - self._start
+        while self._acquired:
+            self._acquired.pop().release(latency, self.status, error)
+
+
+class ConcurrencyLimits:
+    """
+    Requests in flight of a client and every wrapper derived from it.
+
+    `limit` bounds all requests, `per_host` the requests to each host and
+    `per_resource` those to each resource. `limit` is a number or a limiter,
+    e.g. AdaptiveConcurrency; the other two are a number applied to every
+    host or resource, or a dict of numbers or limiters by host or resource
+    name, the others are not limited. A request takes the slot of its
+    resource, then of its host, then the client-wide one.
+    """
+
+    def __init__(self, limit=None, per_host=None, per_resource=None):
+        self.limiter = get_limiter(limit)
+        self.per_host = per_host
+        self.per_resource = per_resource
+        self.hosts = {}
+        self.resources = {}
+
+    @staticmethod
+    def _keyed(limits, limiters, key):
+        limiter = limiters.get(key)
+        if limiter is None:
+            limit = limits.get(key) if isinstance(limits, dict) else limits
+            if limit is None:
+                return None
+            limiter = limiters[key] = get_limiter(limit)
+        return limiter
+
+    def slot(self, url, resource_name=None):
+        limiters = []
+        if self.per_resource is not None and resource_name is not None:
+            limiters.append(
+                self._keyed(self.per_resource, self.resources, resource_name)
+            )
+        if self.per_host is not None:
+            host = urlsplit(str(url)).netloc
+            limiters.append(self._keyed(self.per_host, self.hosts, host))
+        limiters.append(self.limiter)
+        return _LimitsSlot([limiter for limiter in limiters if limiter is not None])
+
+    def try_slot(self, url, resource_name=None):
+        """Slot taken without waiting, None when a limit has no free slot."""
+        slot = self.slot(url, resource_name)
+        return slot if slot.try_acquire() else None
+
+    @property
+    def stats(self):
+        return {
+            "limit": self.limiter.stats if self.limiter is not None else None,
+            "hosts": {host: limiter.stats for host, limiter in self.hosts.items()},
+            "resources": {
+                name: limiter.stats for name, limiter in self.resources.items()
+            },
+        }
+
+
+def get_limits(concurrency):
+    """Client limits from a number, a limiter or ConcurrencyLimits."""
+    if concurrency is None or isinstance(concurrency, ConcurrencyLimits):
+        return concurrency
+    return ConcurrencyLimits(limit=concurrency)
@@ -5,17 +5,68 @@ class ResponseProcessException(Exception):
         super().__init__(*args, **kwargs)
 
 
+class LazyClient:
+    """
+    Stand-in for the client of an error response. Status, data and the
+    response are at hand, the wrapper itself is built on first use.
+    """
+
+    __slots__ = ("response", "data", "request_kwargs", "_factory", "_client")
+
+    def __init__(self, factory, response, data=None, request_kwargs=None):
+        self.response = response
+        self.data = data
+        self.request_kwargs = request_kwargs
+        self._factory = factory
+        self._client = None
+
+    @property
+    def status(self):
+        return self.response.status
+
+    def resolve(self):
+        if self._client is None:
+            self._client = self._factory()
+            self._factory = None
+        return self._client
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+
 class TAPIException(Exception):
+    # Message of errors without data, used without reading the response body.
+    default_message = None
+
     def __init__(self, message, client):
         self.status = None
-        self.client = client
-        if client is not None:
-            self.status = client().status
+        self._client = client
+        response = getattr(client, "response", None)
+        if response is not None:
+            self.status = response.status
 
         if not message:
             message = "response status code: {}".format(self.status)
         super().__init__(message)
 
+    @property
+    def client(self):
+        if isinstance(self._client, LazyClient):
+            self._client = self._client.resolve()
+        return self._client
+
+    @property
+    def data(self):
+        """Native data of the error response, if any."""
+        if self._client is None:
+            return None
+        return self._client.data
+
 
 class ClientError(TAPIException):
     def __init__(self, message="", client=None):
@@ -28,5 +79,7 @@ class ServerError(TAPIException):
 
 
 class NotFound404Error(TAPIException):
-    def __init__(self, message="Error 404 page not found", client=None):
+    default_message = "Error 404 page not found"
+
+    def __init__(self, message=default_message, client=None):
         super().__init__(message, client=client)
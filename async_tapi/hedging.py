@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from .timeouts import LatencyTracker
+
+
+class Hedging:
+    """
+    Hedged GET requests. When no response arrives within `delay` seconds
+    (by default the running `percentile` latency of the resource) an
+    identical request is sent and the first one to finish wins, the other
+    is cancelled. Hedges are capped at `budget` of all hedged calls.
+
+    client = MyClient(hedging=Hedging(percentile=95, budget=0.05))
+    await client.user(id=1).get()              # hedged
+    await client.user(id=1).get(hedge=False)   # not hedged
+
+    Until `min_samples` latencies of a resource are known and no fixed
+    `delay` is given, its requests are not hedged. A hedge takes its own
+    slot of the client's concurrency limits and is skipped when none is
+    free, so hedging never exceeds them.
+    """
+
+    def __init__(
+        self, delay=None, percentile=95, budget=0.05, min_samples=20, window=200
+    ):
+        self.delay = delay
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker(window)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def get_delay(self, resource_name):
+        if self.delay is not None:
+            return self.delay
+        return self.latencies.percentile(
+            resource_name, self.percentile, self.min_samples
+        )
+
+    def _within_budget(self):
+        return self.hedges < self.budget * self.requests
+
+    async def _timed(self, send, slot=None):
+        start = time.monotonic()
+        if slot is None:
+            response = await send()
+        else:
+            async with slot:
+                response = await send()
+                slot.status = response.status
+        return response, time.monotonic() - start
+
+    async def request(self, send, resource_name=None, hedge_slot=None):
+        """
+        Run `send`, a coroutine function returning a response with its body
+        read, hedging it when it is slow. `hedge_slot` returns the slot the
+        hedge runs in, already taken, or None to skip the hedge.
+        """
+        self.requests += 1
+        delay = self.get_delay(resource_name)
+        primary = asyncio.ensure_future(self._timed(send))
+        tasks = [primary]
+        winner = None
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self._within_budget():
+                    slot = hedge_slot() if hedge_slot is not None else None
+                    if hedge_slot is None or slot is not None:
+                        self.hedges += 1
+                        tasks.append(asyncio.ensure_future(self._timed(send, slot)))
+
+            winner = await self._first_success(tasks)
+        finally:
+            for task in tasks:
+                if task is not winner:
+                    self._discard(task)
+
+        if winner is not primary:
+            self.hedge_wins += 1
+        response, latency = winner.result()
+        self.latencies.observe(resource_name, latency)
+        return response
+
+    @staticmethod
+    async def _first_success(tasks):
+        """First task finished without an error, else the error of the primary one."""
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in tasks:
+                if task in done and task.exception() is None:
+                    return task
+        tasks[0].result()
+
+    @staticmethod
+    def _discard(task):
+        """Cancel a losing request, or release its response if it finished too."""
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            response, _ = task.result()
+            response.release()
+
+    @property
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+        }
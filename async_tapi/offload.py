@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+
+def _exceeds(data, limit):
+    """
+    Rough check whether the encoded size of `data` is above `limit` bytes.
+    Stops walking the structure as soon as the limit is reached.
+    """
+    size = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (str, bytes)):
+            size += len(value) + 2
+        elif isinstance(value, dict):
+            size += 2 + 2 * len(value)
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            size += 2 + len(value)
+            stack.extend(value)
+        else:
+            size += 8
+        if size > limit:
+            return True
+    return False
+
+
+class DeferredEncoding:
+    """Request body whose encoding was postponed to the worker pool."""
+
+    __slots__ = ("func", "data")
+
+    def __init__(self, func, data):
+        self.func = func
+        self.data = data
+
+
+class Offloader:
+    """
+    Moves decoding of large responses and encoding of large request bodies
+    off the event loop thread. Bodies under the thresholds stay inline.
+
+    class MyAdapter(TAPIAdapter):
+        offload = Offloader(response_threshold=1024 * 1024,
+                            executor=ProcessPoolExecutor(2))
+
+    `executor` is any concurrent.futures executor, by default the loop's
+    thread pool. With a process pool the adapter has to be picklable.
+    """
+
+    def __init__(
+        self,
+        response_threshold=1024 * 1024,
+        request_threshold=1024 * 1024,
+        executor=None,
+    ):
+        self.response_threshold = response_threshold
+        self.request_threshold = request_threshold
+        self.executor = executor
+        self.stats = {
+            "decode_inline": 0,
+            "decode_offloaded": 0,
+            "encode_inline": 0,
+            "encode_offloaded": 0,
+            "inline_seconds": 0.0,
+            "max_inline_seconds": 0.0,
+            "offloaded_seconds": 0.0,
+        }
+
+    def _run_inline(self, kind, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats[kind + "_inline"] += 1
+            self.stats["inline_seconds"] += elapsed
+            if elapsed > self.stats["max_inline_seconds"]:
+                self.stats["max_inline_seconds"] = elapsed
+
+    async def _run_offloaded(self, kind, func, *args):
+        start = time.perf_counter()
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.stats[kind + "_offloaded"] += 1
+            self.stats["offloaded_seconds"] += time.perf_counter() - start
+
+    async def decode(self, func, content, *args):
+        if len(content) < self.response_threshold:
+            return self._run_inline("decode", func, content, *args)
+        return await self._run_offloaded("decode", func, content, *args)
+
+    def encode(self, func, data):
+        """Encode inline, or return a DeferredEncoding for large bodies."""
+        if _exceeds(data, self.request_threshold):
+            return DeferredEncoding(func, data)
+        return self._run_inline("encode", func, data)
+
+    async def resolve(self, request_kwargs):
+        """Encode a deferred request body in the pool."""
+        body = request_kwargs.get("data")
+        if isinstance(body, DeferredEncoding):
+            request_kwargs["data"] = await self._run_offloaded(
+                "encode", body.func, body.data
+            )
+        return request_kwargs
@@ -0,0 +1,152 @@
+"""
+Request logs through the standard `logging` module.
+
+    client = MyClient(request_logger=RequestLogger(sample_rate=0.01, slow_threshold=500))
+
+Every record carries the request in `record.request`: method, url, params,
+status, elapsed_ms, redacted headers and the truncated body. The body is
+formatted only when a handler actually emits the record.
+"""
+
+import logging
+import random
+
+logger = logging.getLogger("async_tapi")
+
+REDACTED_HEADERS = (
+    "authorization",
+    "proxy-authorization",
+    "cookie",
+    "set-cookie",
+    "x-api-key",
+)
+
+
+class TruncatedBody:
+    """Body of a response, rendered and truncated on first str()."""
+
+    __slots__ = ("client", "limit")
+
+    def __init__(self, client, limit):
+        self.client = client
+        self.limit = limit
+
+    def __str__(self):
+        text = repr(self.client.data)
+        if self.limit is not None and len(text) > self.limit:
+            return "{}... ({} chars)".format(text[: self.limit], len(text))
+        return text
+
+    __repr__ = __str__
+
+
+class RequestLogger:
+    """
+    `sample_rate` is the share of requests logged, `slow_threshold` logs
+    only requests that took at least that many milliseconds (failed ones
+    are always eligible), `max_body` truncates the body, None logs it whole
+    and 0 leaves it out. Headers in `redact_headers` are masked.
+
+    Requests made with `debug=True` skip sampling and the threshold, and
+    are raised to WARNING when the logger would drop them at `level`, so
+    they show up without any logging configuration.
+    """
+
+    def __init__(
+        self,
+        logger=logger,
+        level=logging.DEBUG,
+        error_level=logging.WARNING,
+        sample_rate=1.0,
+        slow_threshold=None,
+        max_body=1000,
+        redact_headers=REDACTED_HEADERS,
+    ):
+        self.logger = logger
+        self.level = level
+        self.error_level = error_level
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.max_body = max_body
+        self.redact_headers = {name.lower() for name in redact_headers}
+
+    def _level(self, level, force):
+        """Level to log at, None when the record would be dropped."""
+        if self.logger.isEnabledFor(level):
+            return level
+        if force and self.logger.isEnabledFor(logging.WARNING):
+            return max(level, logging.WARNING)
+        return None
+
+    def _should_log(self, elapsed_ms, failed, force):
+        if force:
+            return True
+        if (
+            not failed
+            and self.slow_threshold is not None
+            and elapsed_ms < self.slow_threshold
+        ):
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def redact(self, headers):
+        if not headers:
+            return {}
+        return {
+            key: "***" if key.lower() in self.redact_headers else value
+            for key, value in headers.items()
+        }
+
+    def _emit(self, level, method, request_kwargs, status, elapsed_ms, body, error):
+        request = {
+            "method": method,
+            "url": str(request_kwargs.get("url")),
+            "params": request_kwargs.get("params"),
+            "headers": self.redact(request_kwargs.get("headers")),
+            "status": status,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "body": body,
+        }
+        self.logger.log(
+            level,
+            "%s %s -> %s in %.1f ms: %s",
+            method,
+            request["url"],
+            status,
+            elapsed_ms,
+            body if error is None else error,
+            extra={"request": request},
+        )
+
+    def log_response(self, method, client, elapsed, force=False):
+        elapsed_ms = elapsed * 1000
+        level = self._level(self.level, force)
+        if level is None or not self._should_log(elapsed_ms, False, force):
+            return
+        body = None
+        if self.max_body != 0:
+            body = TruncatedBody(client, self.max_body)
+        self._emit(
+            level,
+            method,
+            client.request_kwargs or {},
+            client.status,
+            elapsed_ms,
+            body,
+            None,
+        )
+
+    def log_error(self, method, request_kwargs, error, elapsed, force=False):
+        elapsed_ms = elapsed * 1000
+        level = self._level(self.error_level, force)
+        if level is None or not self._should_log(elapsed_ms, True, force):
+            return
+        self._emit(
+            level,
+            method,
+            request_kwargs,
+            getattr(error, "status", None),
+            elapsed_ms,
+            None,
+            repr(error),
+        )
@@ -0,0 +1,116 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class _Slot:
+    __slots__ = ("scheduler", "priority")
+
+    def __init__(self, scheduler, priority):
+        self.scheduler = scheduler
+        self.priority = priority
+
+    async def __aenter__(self):
+        await self.scheduler.acquire(self.priority)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.scheduler.release()
+
+
+class NullSlot:
+    """Slot of a client without a scheduler."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+class RequestScheduler:
+    """
+    Weighted fair queue in front of the session.
+
+    At most `max_concurrency` requests are sent at once. Waiting requests
+    are dispatched by virtual finish time, so every priority class gets
+    a share of the slots proportional to its weight: interactive requests
+    overtake a long bulk batch, while the batch keeps making progress.
+
+    client = MyClient(scheduler=RequestScheduler(max_concurrency=50))
+    await client.user(id=1).get(priority="interactive")
+    await client.users().post_batch(data=rows, priority="bulk")
+
+    The default class of a resource can be set with a "priority"
+    key in its resource_mapping entry.
+    """
+
+    def __init__(self, max_concurrency=100, weights=None, default_priority="default"):
+        self.max_concurrency = max_concurrency
+        self.weights = weights or {"interactive": 8, "default": 4, "bulk": 1}
+        if default_priority not in self.weights:
+            raise ValueError("Unknown default priority '{}'".format(default_priority))
+        self.default_priority = default_priority
+        self.in_flight = 0
+        self._queue = []
+        self._counter = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish = dict.fromkeys(self.weights, 0.0)
+        self._stats = {
+            priority: {"dispatched": 0, "waited": 0, "wait_seconds": 0.0}
+            for priority in self.weights
+        }
+
+    def slot(self, priority=None):
+        return _Slot(self, priority)
+
+    def _finish_tag(self, priority):
+        start = max(self._virtual_time, self._last_finish[priority])
+        finish = start + 1.0 / self.weights[priority]
+        self._last_finish[priority] = finish
+        return finish
+
+    async def acquire(self, priority=None):
+        priority = priority or self.default_priority
+        if priority not in self.weights:
+            raise ValueError("Unknown priority '{}'".format(priority))
+
+        finish = self._finish_tag(priority)
+        stats = self._stats[priority]
+        if not self._queue and self.in_flight < self.max_concurrency:
+            self._virtual_time = finish
+            self.in_flight += 1
+            stats["dispatched"] += 1
+            return
+
+        waiter = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._queue, (finish, next(self._counter), waiter))
+        start = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        stats["dispatched"] += 1
+        stats["waited"] += 1
+        stats["wait_seconds"] += time.monotonic() - start
+
+    def release(self):
+        self.in_flight -= 1
+        while self._queue and self.in_flight < self.max_concurrency:
+            finish, _, waiter = heapq.heappop(self._queue)
+            if waiter.done():
+                continue
+            self._virtual_time = finish
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    @property
+    def stats(self):
+        return {
+            "in_flight": self.in_flight,
+            "queued": sum(1 for _, _, waiter in self._queue if not waiter.done()),
+            "priorities": {key: dict(value) for key, value in self._stats.items()},
+        }
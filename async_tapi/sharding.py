@@ -0,0 +1,240 @@
+"""
+Batch executor that shards rows across worker processes.
+
+Each worker builds its own client from the same wrapper and params,
+so JSON encoding, serialization and response decoding scale past
+a single core.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+
+from .exceptions import TAPIException
+
+_rate_limiter = None
+
+
+class SharedRateLimiter:
+    """
+    Requests-per-second budget shared by all worker processes.
+    Every request reserves the next free time slot under a process-shared lock.
+    """
+
+    def __init__(self, rate, mp_context=None):
+        mp_context = mp_context or multiprocessing.get_context()
+        self.interval = 1.0 / rate
+        self._next_slot = mp_context.Value("d", 0.0)
+
+    def reserve(self):
+        """Reserve a slot and return how long to wait for it."""
+        with self._next_slot.get_lock():
+            now = time.time()
+            slot = max(now, self._next_slot.value)
+            self._next_slot.value = slot + self.interval
+        return slot - now
+
+    async def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RowError(Exception):
+    """Picklable description of an exception raised for one row."""
+
+    def __init__(self, error_type, message, status=None):
+        self.error_type = error_type
+        self.message = message
+        self.status = status
+        super().__init__("{}: {}".format(error_type, message))
+
+    @classmethod
+    def from_exception(cls, exc):
+        status = exc.status if isinstance(exc, TAPIException) else None
+        return cls(type(exc).__name__, str(exc), status)
+
+    def __reduce__(self):
+        return self.__class__, (self.error_type, self.message, self.status)
+
+
+class ShardedBatchResult:
+    def __init__(self, size):
+        self.results = [None] * size
+        self.statuses = [None] * size
+        self.errors = {}
+        self.stats = {"requests": size, "errors": 0, "shards": []}
+
+    def _merge(self, offset, rows, shard_stats):
+        for index, (status, data, error) in enumerate(rows, start=offset):
+            self.statuses[index] = status
+            if error is None:
+                self.results[index] = data
+            else:
+                self.errors[index] = error
+        self.stats["errors"] = len(self.errors)
+        self.stats["shards"].append(shard_stats)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __getitem__(self, index):
+        return self.results[index]
+
+
+def _init_worker(rate_limiter):
+    global _rate_limiter
+    _rate_limiter = rate_limiter
+
+
+async def _send_shard(
+    wrapper,
+    client_params,
+    session_params,
+    request_method,
+    resource,
+    url_params,
+    rows,
+    concurrency,
+    request_kwargs,
+):
+    semaphore = asyncio.Semaphore(concurrency)
+    session = aiohttp.ClientSession(**session_params)
+
+    async with wrapper(session=session, **client_params) as client:
+        executor = getattr(client, resource)(**url_params)
+
+        async def send(row):
+            async with semaphore:
+                if _rate_limiter is not None:
+                    await _rate_limiter.wait()
+                try:
+                    response = await executor._send(
+                        request_method, **{**request_kwargs, "data": row}
+                    )
+                except Exception as exc:
+                    error = RowError.from_exception(exc)
+                    return error.status, None, error
+                return response.status, response.data, None
+
+        return await asyncio.gather(*[send(row) for row in rows])
+
+
+def _run_shard(offset, *args):
+    start = time.perf_counter()
+    rows = asyncio.run(_send_shard(*args))
+    stats = {
+        "pid": os.getpid(),
+        "offset": offset,
+        "rows": len(rows),
+        "elapsed": time.perf_counter() - start,
+    }
+    return offset, rows, stats
+
+
+class ShardedBatchExecutor:
+    """
+    with ShardedBatchExecutor(MyClient, workers=4, client_params={"token": ...}) as pool:
+        result = pool.post_batch("users", data=rows)
+        result.results, result.errors, result.stats
+
+    The wrapper, params and row data are sent to the workers,
+    so they have to be picklable.
+    """
+
+    def __init__(
+        self,
+        wrapper,
+        workers=None,
+        client_params=None,
+        session_params=None,
+        concurrency=10,
+        rate_limit=None,
+        mp_context=None,
+    ):
+        self.wrapper = wrapper
+        self.workers = workers or os.cpu_count() or 1
+        self.client_params = client_params or {}
+        self.session_params = session_params or {}
+        self.concurrency = concurrency
+        self.rate_limiter = None
+        if rate_limit:
+            self.rate_limiter = SharedRateLimiter(rate_limit, mp_context)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self.rate_limiter,),
+        )
+
+    def _shards(self, data):
+        size = -(-len(data) // self.workers) or 1
+        return [
+            (offset, data[offset : offset + size])
+            for offset in range(0, len(data), size)
+        ]
+
+    def _submit(self, request_method, resource, data, url_params, request_kwargs):
+        return [
+            self._pool.submit(
+                _run_shard,
+                offset,
+                self.wrapper,
+                self.client_params,
+                self.session_params,
+                request_method,
+                resource,
+                url_params or {},
+                rows,
+                self.concurrency,
+                request_kwargs,
+            )
+            for offset, rows in self._shards(list(data))
+        ]
+
+    def run(self, request_method, resource, data, url_params=None, **kwargs):
+        start = time.perf_counter()
+        result = ShardedBatchResult(len(data))
+        for future in self._submit(request_method, resource, data, url_params, kwargs):
+            result._merge(*future.result())
+        result.stats["elapsed"] = time.perf_counter() - start
+        return result
+
+    async def run_async(
+        self, request_method, resource, data, url_params=None, **kwargs
+    ):
+        start = time.perf_counter()
+        result = ShardedBatchResult(len(data))
+        futures = self._submit(request_method, resource, data, url_params, kwargs)
+        for shard in await asyncio.gather(*map(asyncio.wrap_future, futures)):
+            result._merge(*shard)
+        result.stats["elapsed"] = time.perf_counter() - start
+        return result
+
+    def post_batch(self, resource, data, url_params=None, **kwargs):
+        return self.run("POST", resource, data, url_params, **kwargs)
+
+    def put_batch(self, resource, data, url_params=None, **kwargs):
+        return self.run("PUT", resource, data, url_params, **kwargs)
+
+    def patch_batch(self, resource, data, url_params=None, **kwargs):
+        return self.run("PATCH", resource, data, url_params, **kwargs)
+
+    def delete_batch(self, resource, data, url_params=None, **kwargs):
+        return self.run("DELETE", resource, data, url_params, **kwargs)
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,152 @@
+"""
+Small key-value stores for state that has to outlive a run,
+such as pagination checkpoints.
+
+A store is any object with `get(key)`, `set(key, value)` and `delete(key)`,
+values are JSON-serializable.
+"""
+
+import json
+import os
+import tempfile
+
+
+class MemoryStateStore:
+    """Store in a dict, state lives as long as the process."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class JSONFileStateStore:
+    """
+    Store in a JSON file. Every write replaces the file atomically,
+    so a crash leaves either the previous or the new state on disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return {}
+
+    def _dump(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as fh:
+                json.dump(data, fh, default=str)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key, default=None):
+        return self._load().get(key, default)
+
+    def set(self, key, value):
+        data = self._load()
+        data[key] = value
+        self._dump(data)
+
+    def delete(self, key):
+        data = self._load()
+        if data.pop(key, None) is not None:
+            self._dump(data)
+
+
+class Checkpoint:
+    """
+    Position of a paginated walk under `key` of a store: the request of
+    the next page and the number of pages and items consumed before it.
+
+    checkpoint = Checkpoint(JSONFileStateStore("export.json"), "users")
+    async for item in client.users().resume_items(checkpoint):
+        ...
+
+    The checkpoint is written after every fully consumed page and removed
+    when the walk reaches the last page, so a crash repeats at most one page.
+    """
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+
+    def load(self):
+        return self.store.get(self.key)
+
+    def save(self, method, request_kwargs, pages, items):
+        self.store.set(
+            self.key,
+            {
+                "method": method,
+                "request_kwargs": request_kwargs,
+                "pages": pages,
+                "items": items,
+            },
+        )
+
+    def clear(self):
+        self.store.delete(self.key)
+
+    def page_consumed(self, method, next_request_kwargs, pages, items):
+        self.save(method, next_request_kwargs, pages, items)
+
+    def finished(self):
+        self.clear()
+
+
+class Watermark:
+    """
+    High-water mark of a delta sync (timestamp, version or cursor)
+    under `key` of a store.
+
+    watermark = Watermark(JSONFileStateStore("sync.json"), "events")
+    async for item in client.events().sync_items(watermark):
+        ...
+
+    The mark advances with every consumed item and is stored when the
+    walk reaches the last page. With `ordered=True`, for resources that
+    return items in watermark order, it is also stored after every page.
+    """
+
+    def __init__(self, store, key, ordered=False):
+        self.store = store
+        self.key = key
+        self.ordered = ordered
+        self.value = None
+
+    def load(self):
+        self.value = self.store.get(self.key)
+        return self.value
+
+    def advance(self, value, merge=max):
+        if value is None:
+            return
+        self.value = value if self.value is None else merge(self.value, value)
+
+    def save(self):
+        if self.value is not None:
+            self.store.set(self.key, self.value)
+
+    def page_consumed(self, method, next_request_kwargs, pages, items):
+        if self.ordered:
+            self.save()
+
+    def finished(self):
+        self.save()
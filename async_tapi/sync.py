@@ -0,0 +1,190 @@
+import asyncio
+import inspect
+import threading
+
+from .batch import BatchResult
+from .tapi import TAPIClient
+
+_ITEM, _DONE, _ERROR = range(3)
+
+
+class BackgroundLoop:
+    """Event loop running forever in a daemon thread."""
+
+    def __init__(self, name="async-tapi-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name=name, daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro, timeout=None):
+        """Submit a coroutine from any thread and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def iterate(self, async_iterator, prefetch=1):
+        """
+        Consume an async iterator synchronously.
+        Up to `prefetch` items are fetched ahead of the consumer.
+        """
+        queue = self.run(self._make_queue(prefetch))
+
+        async def produce():
+            try:
+                async for item in async_iterator:
+                    await queue.put((_ITEM, item))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                await queue.put((_ERROR, exc))
+            else:
+                await queue.put((_DONE, None))
+            finally:
+                # Stop the iterator now, not whenever it is garbage collected.
+                aclose = getattr(async_iterator, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        producer = asyncio.run_coroutine_threadsafe(produce(), self.loop)
+        try:
+            while True:
+                kind, value = self.run(queue.get())
+                if kind == _DONE:
+                    break
+                if kind == _ERROR:
+                    raise value
+                yield value
+        finally:
+            producer.cancel()
+
+    @staticmethod
+    async def _make_queue(maxsize):
+        return asyncio.Queue(maxsize=maxsize)
+
+    def close(self):
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class SyncTAPIClient:
+    """
+    Synchronous proxy of a TAPIClient or TAPIClientExecutor.
+    Coroutine methods block until done, async generators become
+    generators and derived clients are wrapped again.
+    """
+
+    def __init__(self, client, runner, prefetch=100):
+        self._client = client
+        self._runner = runner
+        self._prefetch = prefetch
+
+    def _wrap(self, value):
+        if isinstance(value, TAPIClient):
+            return SyncTAPIClient(value, self._runner, self._prefetch)
+        if type(value) is list:
+            return [self._wrap(item) for item in value]
+        if isinstance(value, BatchResult):
+            return SyncBatchResult(value, self)
+        return value
+
+    def _sync_method(self, method):
+        def sync_method(*args, **kwargs):
+            return self._wrap(self._runner.run(method(*args, **kwargs)))
+
+        sync_method.__name__ = method.__name__
+        sync_method.__doc__ = method.__doc__
+        return sync_method
+
+    def _sync_iterator(self, method):
+        def sync_iterator(*args, **kwargs):
+            prefetch = kwargs.pop("prefetch", self._prefetch)
+            for item in self._runner.iterate(method(*args, **kwargs), prefetch):
+                yield self._wrap(item)
+
+        sync_iterator.__name__ = method.__name__
+        sync_iterator.__doc__ = method.__doc__
+        return sync_iterator
+
+    def __getattr__(self, name):
+        if name in ("_client", "_runner", "_prefetch"):
+            raise AttributeError(name)
+        attr = getattr(self._client, name)
+        if inspect.isasyncgenfunction(attr):
+            return self._sync_iterator(attr)
+        if inspect.iscoroutinefunction(attr):
+            return self._sync_method(attr)
+        return self._wrap(attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._wrap(self._client(*args, **kwargs))
+
+    def __getitem__(self, key):
+        return self._client[key]
+
+    def __iter__(self):
+        return iter(self._client)
+
+    def __len__(self):
+        return len(self._client)
+
+    def __contains__(self, key):
+        return key in self._client
+
+    def __dir__(self):
+        return dir(self._client)
+
+    def __str__(self):
+        return str(self._client)
+
+
+class SyncBatchResult(BatchResult):
+    """BatchResult of a synchronous client, `retry_failed` blocks until done."""
+
+    def __init__(self, result, client):
+        super().__init__(
+            [client._wrap(item) for item in result], result.timings, result.elapsed
+        )
+        self._result = result
+        self._client = client
+
+    def retry_failed(self):
+        return self._client._wrap(self._client._runner.run(self._result.retry_failed()))
+
+
+class SyncClient(SyncTAPIClient):
+    """
+    Synchronous client that owns a long-lived event loop in a background
+    thread, so every call from every thread reuses one session and its
+    connection pool.
+
+    with MyClient.sync(token=...) as client:
+        response = client.user(id=1).get()
+        for item in response().iter_items(prefetch=500):
+            ...
+    """
+
+    def __init__(self, wrapper, prefetch=100, **kwargs):
+        runner = BackgroundLoop()
+        try:
+            client = runner.run(wrapper(**kwargs).__aenter__())
+        except BaseException:
+            runner.close()
+            raise
+        super().__init__(client, runner, prefetch)
+
+    def close(self):
+        if self._runner.loop.is_closed():
+            return
+        try:
+            self._runner.run(self._client.__aexit__(None, None, None))
+        finally:
+            self._runner.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
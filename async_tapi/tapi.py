@@ -1,11 +1,40 @@
-import copy
 import json
 import asyncio
-import aiohttp
-import webbrowser
-from collections import OrderedDict
-
-from .exceptions import ResponseProcessException
+import hashlib
+import time
+from collections import Counter, OrderedDict
+from functools import partial
+
+from .batch import BatchResult
+from .concurrency import get_limiter, get_limits
+from .exceptions import LazyClient, ResponseProcessException, TAPIException
+from .scheduling import NullSlot
+from .timeouts import AdaptiveTimeout, DeadlineSlot, client_timeout
+
+# Per-call options consumed by the client and not sent with the request.
+REQUEST_OPTIONS = {
+    "lazy": False,
+    "status_only": False,
+    "priority": None,
+    "cache": True,
+    "timeout": None,
+    "deadline": None,
+    "hedge": True,
+}
+
+# Client attributes, by the private attribute behind them. They are looked up
+# after the resources, so a resource with the same name keeps its name.
+CLIENT_ATTRIBUTES = {
+    # Counters shared by the client and every wrapper derived from it.
+    "stats": "_stats",
+    "reset_request_templates": "_reset_request_templates",
+    "send_batch": "_send_rows",
+    "get_batch": "_get_rows",
+    "iter_batch": "_iter_rows",
+}
+
+# Rows in progress at once in `TAPIClient.send_batch` and `iter_batch`.
+BATCH_CONCURRENCY = 10
 
 
 class TAPIInstaller:
@@ -13,7 +42,17 @@ class TAPIInstaller:
         self.adapter_class = adapter_class
 
     def __call__(
-        self, serializer_class=None, session=None, resource_mapping=None, **kwargs
+        self,
+        serializer_class=None,
+        session=None,
+        resource_mapping=None,
+        scheduler=None,
+        cache=None,
+        timeout=None,
+        hedging=None,
+        request_logger=None,
+        concurrency=None,
+        **kwargs,
     ):
         refresh_token_default = kwargs.pop("refresh_token_by_default", False)
         return TAPIClient(
@@ -24,8 +63,20 @@ class TAPIInstaller:
             api_params=kwargs,
             refresh_token_by_default=refresh_token_default,
             session=session,
+            scheduler=scheduler,
+            cache=cache,
+            timeout=timeout,
+            hedging=hedging,
+            request_logger=request_logger,
+            limits=get_limits(concurrency),
         )
 
+    def sync(self, **kwargs):
+        """Synchronous client backed by a background event loop."""
+        from .sync import SyncClient
+
+        return SyncClient(self, **kwargs)
+
 
 class TAPIClient:
     def __init__(
@@ -41,11 +92,21 @@ class TAPIClient:
         session=None,
         store=None,
         resource_name=None,
+        content=None,
+        stats=None,
+        scheduler=None,
+        cache=None,
+        timeout=None,
+        hedging=None,
+        request_logger=None,
+        templates=None,
+        limits=None,
         *args,
         **kwargs,
     ):
         self._api = api
         self._data = data
+        self._content = content
         self._response = response
         self._api_params = api_params or {}
         self._request_kwargs = request_kwargs
@@ -55,9 +116,20 @@ class TAPIClient:
         self._refresh_data = refresh_data
         self._session = session
         self.store = store or {}
+        self._stats = stats if stats is not None else Counter()
+        self._scheduler = scheduler
+        self._cache = cache
+        self._timeout = timeout
+        self._hedging = hedging
+        self._request_logger = request_logger
+        # Request templates per resource name, shared with every wrapper.
+        self._templates = templates if templates is not None else {}
+        self._limits = limits
 
     async def __aenter__(self):
         if self._session is None:
+            import aiohttp
+
             self._session = aiohttp.ClientSession()
         return self
 
@@ -67,6 +139,12 @@ class TAPIClient:
 
     @property
     def data(self):
+        if self._content is not None:
+            # Body of a lazy request, decoded on first access.
+            self._data = self._api.content_to_native(
+                self._content, self._response.get_encoding()
+            )
+            self._content = None
         return self._data
 
     @property
@@ -102,6 +180,14 @@ class TAPIClient:
             resource_name=resource_name,
             session=self._session,
             store=self.store,
+            stats=self._stats,
+            scheduler=self._scheduler,
+            cache=self._cache,
+            timeout=self._timeout,
+            hedging=self._hedging,
+            request_logger=self._request_logger,
+            templates=self._templates,
+            limits=self._limits,
             *args,
             **kwargs,
         )
@@ -118,12 +204,20 @@ class TAPIClient:
             resource_name=self._resource_name,
             session=self._session,
             store=self.store,
+            stats=self._stats,
+            scheduler=self._scheduler,
+            cache=self._cache,
+            timeout=self._timeout,
+            hedging=self._hedging,
+            request_logger=self._request_logger,
+            templates=self._templates,
+            limits=self._limits,
             *args,
             **kwargs,
         )
 
     def _get_doc(self):
-        resources = copy.copy(self._resource)
+        resources = dict(self._resource)
         docs = (
             "Automatic generated __doc__ from resource_mapping.\n"
             "Resource: %s\n"
@@ -137,10 +231,10 @@ class TAPIClient:
     __doc__ = property(_get_doc)
 
     def __call__(self, *args, **kwargs):
-        data = self._data
+        data = self.data
 
-        url_params = self._api_params.get("default_url_params", {})
-        url_params.update(kwargs)
+        # A copy, the defaults must not keep the params of previous calls.
+        url_params = {**self._api_params.get("default_url_params", {}), **kwargs}
         if self._resource and url_params:
             data = self._api.fill_resource_template_url(
                 self._data, url_params, self._resource_name
@@ -150,6 +244,103 @@ class TAPIClient:
             data, resource=self._resource, response=self._response
         )
 
+    def _batch_executor(self, url_params):
+        return self(**(url_params or {}))
+
+    async def _iter_batch(self, request_method, rows, concurrency, kwargs):
+        """
+        Send a request per row from a fixed number of workers, so only
+        `concurrency` rows are in progress however many there are.
+        Yields `(index, result, seconds)` in completion order.
+        """
+        limiter = get_limiter(concurrency or BATCH_CONCURRENCY)
+        workers = max(int(getattr(limiter, "max_limit", limiter.limit)), 1)
+        rows = enumerate(rows)
+        queue = asyncio.Queue(workers)
+
+        async def send(row):
+            row = dict(row)
+            executor = self._batch_executor(row.pop("url_params", None))
+            return await executor._send_limited(
+                limiter, request_method, **{**kwargs, **row}
+            )
+
+        async def worker():
+            cancelled = False
+            try:
+                for index, row in rows:
+                    result, timing = await TAPIClientExecutor._timed(send(row))
+                    await queue.put((index, result, timing))
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Once cancelled nobody reads the queue, a put could block forever.
+                if not cancelled:
+                    await queue.put(None)
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+        try:
+            running = len(tasks)
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running -= 1
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _iter_rows(
+        self, request_method, rows, concurrency=BATCH_CONCURRENCY, **kwargs
+    ):
+        """
+        `iter_batch`: send a request per row and yield `(index, result)` as soon as each
+        one completes. A row is a dict with `url_params` to fill the resource
+        url and any request kwargs (`params`, `data`, `headers`...) overlaid
+        on the call kwargs. A failed row yields its exception.
+        """
+        batch = self._iter_batch(request_method, rows, concurrency, kwargs)
+        try:
+            async for index, result, _ in batch:
+                yield index, result
+        finally:
+            # Closing this stream early stops the workers right away.
+            await batch.aclose()
+
+    async def _send_rows(
+        self, request_method, rows, concurrency=BATCH_CONCURRENCY, **kwargs
+    ):
+        """`send_batch`: send a request per row, see `iter_batch`, return a `BatchResult`."""
+        start = time.monotonic()
+        rows = list(rows)
+        results = [None] * len(rows)
+        timings = [None] * len(rows)
+        async for index, result, timing in self._iter_batch(
+            request_method, rows, concurrency, kwargs
+        ):
+            results[index] = result
+            timings[index] = timing
+
+        def resend(rows):
+            return self._send_rows(
+                request_method, rows, concurrency=concurrency, **kwargs
+            )
+
+        return BatchResult(
+            results, timings, time.monotonic() - start, rows=rows, resend=resend
+        )
+
+    async def _get_rows(self, rows, concurrency=BATCH_CONCURRENCY, **kwargs):
+        """
+        `get_batch`: GET the resource for every row:
+
+            await client.user.get_batch([{"url_params": {"id": id}} for id in ids])
+        """
+        return await self._send_rows("GET", rows, concurrency=concurrency, **kwargs)
+
     """
     Convert a snake_case string in CamelCase.
     http://stackoverflow.com/questions/19053707/convert-snake-case-snake-case-to-lower-camel-case-lowercamelcase-in-python
@@ -165,16 +356,28 @@ class TAPIClient:
         # if could not access, falback to resource mapping
         resource_mapping = self._api.resource_mapping
         if name in resource_mapping:
-            resource = resource_mapping[name]
-            api_root = self._api.get_api_root(self._api_params, resource_name=name)
-            url = api_root.rstrip("/") + "/" + resource["resource"].lstrip("/")
-            return self._wrap_in_tapi(url, resource=resource, resource_name=name)
+            return self._wrap_in_tapi(
+                self._request_template(name).url,
+                resource=resource_mapping[name],
+                resource_name=name,
+            )
 
         if name in self.store:
             return self.store[name]
 
         return None
 
+    def _request_template(self, resource_name):
+        template = self._templates.get(resource_name)
+        if template is None:
+            template = self._api.get_request_template(self._api_params, resource_name)
+            self._templates[resource_name] = template
+        return template
+
+    def _reset_request_templates(self):
+        """Rebuild request templates on next use, after `api_params` changed."""
+        self._templates.clear()
+
     def _get_client_from_name_or_fallback(self, name):
         client = self._get_client_from_name(name)
         if client is not None:
@@ -197,27 +400,29 @@ class TAPIClient:
     def __getattr__(self, name):
         ret = self._get_client_from_name_or_fallback(name)
         if ret is None:
+            if name in CLIENT_ATTRIBUTES:
+                return getattr(self, CLIENT_ATTRIBUTES[name])
             raise AttributeError(f"Undeclared resource '{name}'")
         return ret
 
     def __getitem__(self, key):
-        return self._data[key]
+        return self.data[key]
 
     def __setitem__(self, key, value):
-        self._data[key] = value
+        self.data[key] = value
 
     def __delitem__(self, key):
-        del self._data[key]
+        del self.data[key]
 
     def __iter__(self):
-        self._it = iter(self._data)
+        self._it = iter(self.data)
         return self
 
     def __next__(self):
         return next(self._it)
 
     def __dir__(self):
-        if self._api and self._data is None:
+        if self._api and self.data is None:
             return list(self._api.resource_mapping.keys())
 
         return list(self.store.keys()) + ["data", "response", "store"]
@@ -225,7 +430,7 @@ class TAPIClient:
     def __str__(self):
         try:
             return self._api.__str__(
-                self._data, self._request_kwargs, self._response, self._api_params
+                self.data, self._request_kwargs, self._response, self._api_params
             )
         except NotImplementedError:
             if type(self._data) == OrderedDict:
@@ -244,10 +449,10 @@ class TAPIClient:
         p.text(self.__str__())
 
     def __len__(self):
-        return len(self._data)
+        return len(self.data)
 
     def __contains__(self, key):
-        return key in self._data
+        return key in self.data
 
 
 class TAPIClientExecutor(TAPIClient):
@@ -265,11 +470,18 @@ class TAPIClientExecutor(TAPIClient):
     def __getattr__(self, name):
         if name.startswith("to_") or name in self._api.native_methods:
             return self._api._get_to_native_method(name, self._data, **self._context())
+        if name in CLIENT_ATTRIBUTES:
+            return getattr(self, CLIENT_ATTRIBUTES[name])
         raise AttributeError(name)
 
     def __call__(self, *args, **kwargs):
         return self._wrap_in_tapi(self._data.__call__(*args, **kwargs))
 
+    def _batch_executor(self, url_params):
+        if url_params:
+            raise TypeError("The url of this request is already filled")
+        return self
+
     @property
     def request_kwargs(self):
         return self._request_kwargs
@@ -303,54 +515,211 @@ class TAPIClientExecutor(TAPIClient):
             **kwargs,
         }
 
+    def _pop_request_options(self, kwargs):
+        """Options that control how the request is sent, not the request itself."""
+        return {
+            name: kwargs.pop(name, default) for name, default in REQUEST_OPTIONS.items()
+        }
+
+    def _request_slot(self, priority=None):
+        if self._scheduler is None:
+            return NullSlot()
+        if priority is None and self._resource:
+            priority = self._resource.get("priority")
+        return self._scheduler.slot(priority)
+
+    def _resolve_timeout(self, timeout=None):
+        """Timeout of the call, else of the resource, else of the client."""
+        if timeout is None and self._resource:
+            timeout = self._resource.get("timeout")
+        if timeout is None:
+            timeout = self._timeout
+        return timeout
+
     async def _make_request(
-        self, request_method, refresh_token=None, repeat_number=0, *args, **kwargs
+        self,
+        request_method,
+        refresh_token=None,
+        repeat_number=0,
+        *args,
+        deadline_at=None,
+        **kwargs,
     ):
+        options = self._pop_request_options(kwargs)
+        if options["deadline"] is not None and deadline_at is None:
+            # The deadline covers every retry and token refresh of the call.
+            deadline_at = time.monotonic() + options["deadline"]
         if "url" not in kwargs:
             kwargs["url"] = self._data
 
         request_kwargs = self._api.get_request_kwargs(
-            self._api_params, request_method, *args, **kwargs
+            self._api_params,
+            request_method,
+            *args,
+            template=self._request_template(self._resource_name),
+            **kwargs,
         )
+        if self._api.offload is not None:
+            request_kwargs = await self._api.offload.resolve(request_kwargs)
+
+        response, cache_key = None, None
+        if self._cache is not None and options["cache"] and request_method == "GET":
+            cache_key = self._cache.key(
+                request_method,
+                request_kwargs["url"],
+                request_kwargs.get("params"),
+                request_kwargs.get("data"),
+                request_kwargs.get("headers"),
+            )
+            response = await self._cache.get(cache_key)
+            self._stats["cache_misses" if response is None else "cache_hits"] += 1
+
+        timeout = self._resolve_timeout(options["timeout"])
+        if deadline_at is not None and deadline_at <= time.monotonic():
+            raise asyncio.TimeoutError("Deadline of the request exceeded")
 
         response_data = None
-        response = await self._session.request(request_method, **request_kwargs)
-        try:
-            response_data = await self._api.process_response(
-                **self._context(response=response, request_kwargs=request_kwargs)
-            )
-        except ResponseProcessException as e:
+        error = None
+        # A cached response does not take a scheduler slot.
+        slot = (
+            NullSlot()
+            if response is not None
+            else self._request_slot(options["priority"])
+        )
+        # Client-wide limits of requests in flight, a cached response skips them too.
+        limits_slot = (
+            NullSlot()
+            if response is not None or self._limits is None
+            else self._limits.slot(request_kwargs["url"], self._resource_name)
+        )
+        limits_wait = limits_slot
+        if deadline_at is not None:
+            # Waiting for a slot counts against the deadline.
+            slot = DeadlineSlot(slot, deadline_at)
+            limits_wait = DeadlineSlot(limits_slot, deadline_at)
+        # The scheduler slot is taken last: a request waiting for a client
+        # limit must not hold a slot that other priorities could use.
+        async with limits_wait, slot:
+            if response is None:
+                remaining = None
+                if deadline_at is not None:
+                    remaining = deadline_at - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError("Deadline of the request exceeded")
+                session_kwargs = {}
+                total_timeout = client_timeout(timeout, self._resource_name, remaining)
+                if total_timeout is not None:
+                    session_kwargs["timeout"] = total_timeout
+                start = time.monotonic()
+                try:
+                    if (
+                        self._hedging is not None
+                        and options["hedge"]
+                        and request_method == "GET"
+                    ):
+                        hedge_slot = None
+                        if self._limits is not None:
+                            hedge_slot = partial(
+                                self._limits.try_slot,
+                                request_kwargs["url"],
+                                self._resource_name,
+                            )
+                        response = await self._hedging.request(
+                            lambda: self._fetch(
+                                request_method, request_kwargs, session_kwargs
+                            ),
+                            self._resource_name,
+                            hedge_slot,
+                        )
+                    else:
+                        response = await self._session.request(
+                            request_method, **request_kwargs, **session_kwargs
+                        )
+                except asyncio.TimeoutError:
+                    self._stats["timeouts"] += 1
+                    raise
+                limits_slot.status = response.status
+                if isinstance(timeout, AdaptiveTimeout):
+                    timeout.observe(self._resource_name, time.monotonic() - start)
+                if cache_key is not None and 200 <= response.status < 300:
+                    await self._cache.set(cache_key, response)
+
+            if (options["lazy"] or options["status_only"]) and (
+                200 <= response.status < 300
+            ):
+                content = None
+                if options["status_only"]:
+                    await self._discard_body(response)
+                else:
+                    content = await response.read()
+                return self._wrap_in_tapi(
+                    None,
+                    response=response,
+                    request_kwargs=request_kwargs,
+                    content=content,
+                )
+
+            try:
+                response_data = await self._api.process_response(
+                    **self._context(response=response, request_kwargs=request_kwargs)
+                )
+            except ResponseProcessException as e:
+                error = e
+
+        if error is not None:
             repeat_number += 1
-            client = self._wrap_in_tapi(
-                e.data, response=response, request_kwargs=request_kwargs
+            # The wrapper is only built if a hook or the caller asks for it.
+            client = LazyClient(
+                partial(
+                    self._wrap_in_tapi,
+                    error.data,
+                    response=response,
+                    request_kwargs=request_kwargs,
+                ),
+                response,
+                error.data,
+                request_kwargs,
             )
             context = self._context(
                 response=response, request_kwargs=request_kwargs, client=client
             )
-            error_message = await self._api.get_error_message(
-                data=e.data, response=response
-            )
-            tapi_exception = e.tapi_exception(message=error_message, client=client)
-
+            # Past the deadline the error is raised instead of repeating.
+            can_repeat = deadline_at is None or time.monotonic() < deadline_at
             should_refresh_token = (
-                refresh_token is not False and self._refresh_token_default
+                can_repeat
+                and refresh_token is not False
+                and self._refresh_token_default
             )
-            auth_expired = self._api.is_authentication_expired(
+            # An error with a fixed message, e.g. a 404, only has its body
+            # read and decoded when a hook may look at the message.
+            error_message = getattr(error.tapi_exception, "default_message", None)
+            if (
+                error.data is not None
+                or error_message is None
+                or self._api._needs_error_message(should_refresh_token)
+            ):
+                error_message = await self._api.get_error_message(
+                    data=error.data, response=response
+                )
+            tapi_exception = error.tapi_exception(message=error_message, client=client)
+            if should_refresh_token and self._api.is_authentication_expired(
                 tapi_exception, **context
-            )
-
-            if should_refresh_token and auth_expired:
+            ):
                 self._refresh_data = self._api.refresh_authentication(**context)
+                # The refresh usually changes the credentials in `api_params`.
+                self._templates.clear()
                 if self._refresh_data:
                     return await self._make_request(
                         request_method,
                         refresh_token=False,
                         repeat_number=repeat_number,
                         *args,
+                        deadline_at=deadline_at,
+                        **options,
                         **kwargs,
                     )
 
-            if self._api.retry_request(
+            if can_repeat and self._api.retry_request(
                 tapi_exception, error_message, repeat_number, **context
             ):
                 return await self._make_request(
@@ -358,6 +727,8 @@ class TAPIClientExecutor(TAPIClient):
                     refresh_token=False,
                     repeat_number=repeat_number,
                     *args,
+                    deadline_at=deadline_at,
+                    **options,
                     **kwargs,
                 )
 
@@ -369,30 +740,227 @@ class TAPIClientExecutor(TAPIClient):
             response_data, response=response, request_kwargs=request_kwargs
         )
 
+    async def _fetch(self, request_method, request_kwargs, session_kwargs):
+        """Send a request and read its body, a hedge races the whole exchange."""
+        response = await self._session.request(
+            request_method, **request_kwargs, **session_kwargs
+        )
+        await response.read()
+        return response
+
+    @staticmethod
+    async def _discard_body(response):
+        """Drain the body without keeping it, so the connection can be reused."""
+        content = getattr(response, "content", None)
+        if content is not None:
+            while await content.readany():
+                pass
+        response.release()
+
     async def _send(self, request_method, *args, **kwargs):
         debug = kwargs.pop("debug") if "debug" in kwargs else False
-        response = await self._make_request(request_method, *args, **kwargs)
-        if debug:
-            response_info = "status: {} - response data: {}".format(
-                response.status, response.data
+        request_logger = self._request_logger
+        if request_logger is None:
+            if not debug:
+                return await self._make_request(request_method, *args, **kwargs)
+            from .request_log import RequestLogger
+
+            request_logger = RequestLogger()
+
+        start = time.monotonic()
+        try:
+            response = await self._make_request(request_method, *args, **kwargs)
+        except Exception as error:
+            request_kwargs = {"url": kwargs.get("url", self._data), **kwargs}
+            request_logger.log_error(
+                request_method,
+                request_kwargs,
+                error,
+                time.monotonic() - start,
+                force=debug,
             )
-            print(response_info)
+            raise
+        request_logger.log_response(
+            request_method, response, time.monotonic() - start, force=debug
+        )
         return response
 
-    async def _send_batch(self, request_method, *args, **kwargs):
+    def _deduplicate(self, rows):
+        """
+        Group rows by the hash of their serialized form.
+        Returns unique rows and, for every original row, its unique index.
+        """
+        unique_rows = []
+        positions = []
+        indexes = {}
+        for row in rows:
+            serialized = json.dumps(
+                self._api.serialize_data(row), sort_keys=True, default=repr
+            )
+            key = hashlib.blake2b(serialized.encode(), digest_size=16).digest()
+            if key not in indexes:
+                indexes[key] = len(unique_rows)
+                unique_rows.append(row)
+            positions.append(indexes[key])
+        return unique_rows, positions
+
+    def _pack(self, rows):
+        """
+        Split rows into chunks within the adapter's pack_max_items
+        and pack_max_bytes. A row larger than the byte limit gets its own chunk.
+        """
+        max_items = self._api.pack_max_items
+        max_bytes = self._api.pack_max_bytes
+        chunks = []
+        chunk, chunk_size = [], 2
+        for row in rows:
+            row_size = 0
+            if max_bytes is not None:
+                row_size = (
+                    len(json.dumps(self._api.serialize_data(row), default=str)) + 1
+                )
+            if chunk and (
+                (max_items is not None and len(chunk) >= max_items)
+                or (max_bytes is not None and chunk_size + row_size > max_bytes)
+            ):
+                chunks.append(chunk)
+                chunk, chunk_size = [], 2
+            chunk.append(row)
+            chunk_size += row_size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def _send_pack(self, limiter, request_method, rows, *args, **kwargs):
+        """Send rows in one request and split its response per row."""
+        envelope = self._api.build_pack_envelope(rows=rows, **self._context())
+        response = await self._send_limited(
+            limiter, request_method, *args, **{**kwargs, "data": envelope}
+        )
+        results = self._api.split_pack_response(
+            response_data=response.data,
+            rows=rows,
+            **self._context(
+                response=response.response, request_kwargs=response.request_kwargs
+            ),
+        )
+        results = list(results)
+        if len(results) != len(rows):
+            raise ValueError(
+                "split_pack_response returned {} results for {} rows".format(
+                    len(results), len(rows)
+                )
+            )
+        return [
+            self._wrap_in_tapi(
+                result,
+                response=response.response,
+                request_kwargs=response.request_kwargs,
+            )
+            for result in results
+        ]
+
+    async def _send_limited(self, limiter, request_method, *args, **kwargs):
+        """Send a request inside a slot of the concurrency limiter."""
+        if limiter is None:
+            return await self._send(request_method, *args, **kwargs)
+
+        await limiter.acquire()
+        start = time.monotonic()
+        latency = status = None
+        error = False
+        try:
+            response = await self._send(request_method, *args, **kwargs)
+            status = response.status
+            return response
+        except TAPIException as exc:
+            status, error = exc.status, True
+            raise
+        except Exception:
+            error = True
+            raise
+        finally:
+            if status is not None or error:
+                latency = time.monotonic() - start
+            limiter.release(latency, status, error)
 
+    @staticmethod
+    async def _timed(coroutine):
+        """Await a request of a batch, an exception becomes its result."""
+        start = time.monotonic()
+        try:
+            result = await coroutine
+        except Exception as error:
+            result = error
+        return result, time.monotonic() - start
+
+    async def _send_batch(self, request_method, *args, **kwargs):
+        start = time.monotonic()
         data = kwargs.pop("data") if "data" in kwargs else []
-        semaphore = kwargs.pop("semaphore") if "semaphore" in kwargs else 1
+        semaphore = kwargs.pop("semaphore") if "semaphore" in kwargs else None
+        concurrency = kwargs.pop("concurrency") if "concurrency" in kwargs else None
+        dedup = kwargs.pop("dedup") if "dedup" in kwargs else False
+        pack = kwargs.pop("pack") if "pack" in kwargs else False
+        limiter = get_limiter(concurrency or semaphore)
+
+        def resend(rows):
+            return self._send_batch(
+                request_method,
+                *args,
+                data=rows,
+                semaphore=semaphore,
+                concurrency=concurrency,
+                dedup=dedup,
+                pack=pack,
+                **kwargs,
+            )
 
-        async with asyncio.Semaphore(semaphore):
-            results = await asyncio.gather(
+        rows = data
+        positions = None
+        if dedup:
+            data, positions = self._deduplicate(data)
+            self._stats["batch_deduplicated"] += len(positions) - len(data)
+
+        if pack:
+            chunks = self._pack(data)
+            self._stats["batch_packed_requests"] += len(chunks)
+            self._stats["batch_packed_rows"] += len(data)
+            packed = await asyncio.gather(
+                *[
+                    self._timed(
+                        self._send_pack(limiter, request_method, chunk, *args, **kwargs)
+                    )
+                    for chunk in chunks
+                ]
+            )
+            # A failed request fails every row packed into it.
+            timed = [
+                (result[index] if isinstance(result, list) else result, timing)
+                for chunk, (result, timing) in zip(chunks, packed)
+                for index in range(len(chunk))
+            ]
+        else:
+            timed = await asyncio.gather(
                 *[
-                    self._send(request_method, *args, **{**kwargs, "data": row})
+                    self._timed(
+                        self._send_limited(
+                            limiter, request_method, *args, **{**kwargs, "data": row}
+                        )
+                    )
                     for row in data
                 ]
             )
 
-        return results
+        if positions is not None:
+            timed = [timed[index] for index in positions]
+
+        return BatchResult(
+            [result for result, _ in timed],
+            [timing for _, timing in timed],
+            time.monotonic() - start,
+            rows=rows,
+            resend=resend,
+        )
 
     async def get(self, *args, **kwargs):
         return await self._send("GET", *args, **kwargs)
@@ -446,61 +1014,166 @@ class TAPIClientExecutor(TAPIClient):
         reached_item_limit = max_items is not None and max_items <= item_count
         return reached_page_limit or reached_item_limit
 
-    async def iter_items(self, max_pages=None, max_items=None):
-        executor = self
-        iterator_list = executor._get_iterator_iteritems()
-        page_count = 0
-        item_count = 0
+    async def _follow_pages(self, executor, limiter=None):
+        """
+        `executor` of a page and of every following one, together with
+        the request method and kwargs of its next page. A page is requested
+        only when the consumer asks for it, after the previous one is released.
+        """
+        while True:
+            next_request_kwargs = executor._get_iterator_next_request_kwargs()
+            method = executor.response.method
+            yield executor, method, next_request_kwargs
+            executor = None
+            if not next_request_kwargs:
+                return
+            executor = (
+                await self._send_limited(limiter, method, **next_request_kwargs)
+            )()
 
-        while iterator_list:
+    async def _iter_items(
+        self,
+        executor,
+        limiter=None,
+        max_pages=None,
+        max_items=None,
+        checkpoint=None,
+        page_count=0,
+        item_count=0,
+    ):
+        pages = self._follow_pages(executor, limiter)
+        executor = None
+        async for page, method, next_request_kwargs in pages:
+            iterator_list = page._get_iterator_iteritems()
+            page = None
+            if not iterator_list:
+                if checkpoint is not None:
+                    checkpoint.finished()
+                return
             if self._reached_max_limit(page_count, item_count, max_pages, max_items):
-                break
+                return
 
             for item in iterator_list:
                 if self._reached_max_limit(
                     page_count, item_count, max_pages, max_items
                 ):
-                    break
+                    return
                 yield item
                 item_count += 1
+            iterator_list = item = None
 
             page_count += 1
+            if checkpoint is not None:
+                if next_request_kwargs:
+                    checkpoint.page_consumed(
+                        method, next_request_kwargs, page_count, item_count
+                    )
+                else:
+                    checkpoint.finished()
 
-            next_request_kwargs = executor._get_iterator_next_request_kwargs()
+    async def iter_items(
+        self, max_pages=None, max_items=None, concurrency=None, checkpoint=None
+    ):
+        """
+        Items of this page and the following ones.
+        With a `checkpoint` the position is saved after every page,
+        see `resume_items`.
+        """
+        items = self._iter_items(
+            self, get_limiter(concurrency), max_pages, max_items, checkpoint
+        )
+        async for item in items:
+            yield item
 
-            if not next_request_kwargs:
-                break
+    async def resume_items(
+        self,
+        checkpoint,
+        max_pages=None,
+        max_items=None,
+        concurrency=None,
+        *args,
+        **kwargs,
+    ):
+        """
+        Continue a walk from the page saved in `checkpoint`, or start it
+        with a GET of this resource when there is nothing saved.
+        Page and item limits count what was consumed before the checkpoint.
+        """
+        limiter = get_limiter(concurrency)
+        state = checkpoint.load()
+        if state is None:
+            page_count = item_count = 0
+            response = await self._send_limited(limiter, "GET", *args, **kwargs)
+        else:
+            page_count, item_count = state["pages"], state["items"]
+            response = await self._send_limited(
+                limiter, state["method"], **state["request_kwargs"]
+            )
 
-            request_method = executor.response.method.lower()
-            method = getattr(self, request_method)
-            response = await method(**next_request_kwargs)
-            executor = response()
-            iterator_list = executor._get_iterator_iteritems()
+        items = self._iter_items(
+            response(),
+            limiter,
+            max_pages,
+            max_items,
+            checkpoint,
+            page_count,
+            item_count,
+        )
+        response = None
+        async for item in items:
+            yield item
 
-    async def pages(self, max_pages=None):
-        executor = self
-        pages = executor._get_iterator_pages()
+    async def sync_items(
+        self,
+        watermark,
+        max_pages=None,
+        max_items=None,
+        concurrency=None,
+        *args,
+        **kwargs,
+    ):
+        """
+        Items changed since the stored `watermark`, see state.Watermark.
+        The adapter turns the stored mark into request kwargs with
+        `get_watermark_request_kwargs` and reads the mark of every item
+        with `get_item_watermark`. Without a stored mark everything is fetched.
+        """
+        limiter = get_limiter(concurrency)
+        context = self._context()
+        if watermark.load() is not None:
+            kwargs = self._api.get_watermark_request_kwargs(
+                watermark=watermark.value,
+                **{**context, "request_kwargs": kwargs},
+            )
+        response = await self._send_limited(limiter, "GET", *args, **kwargs)
+
+        items = self._iter_items(response(), limiter, max_pages, max_items, watermark)
+        response = None
+        async for item in items:
+            yield item
+            watermark.advance(
+                self._api.get_item_watermark(item=item, **context),
+                self._api.merge_watermarks,
+            )
+
+    async def pages(self, max_pages=None, concurrency=None):
         page_count = 0
+        walk = self._follow_pages(self, get_limiter(concurrency))
+        async for executor, _, _ in walk:
+            pages = executor._get_iterator_pages()
+            executor = None
+            if not pages:
+                return
 
-        while pages:
             for page in pages:
                 if self._reached_max_limit(page_count, None, max_pages, None):
-                    break
+                    return
                 yield self._wrap_in_tapi(page)
                 page_count += 1
+            pages = page = None
 
-            next_request_kwargs = executor._get_iterator_next_request_kwargs()
-
-            if not next_request_kwargs or self._reached_max_limit(
-                page_count, None, max_pages, None
-            ):
-                break
-
-            request_method = executor.response.method.lower()
-            method = getattr(self, request_method)
-            response = await method(**next_request_kwargs)
-            executor = response()
-            pages = executor._get_iterator_pages()
+            if self._reached_max_limit(page_count, None, max_pages, None):
+                return
 
     def items(self, max_items=None):
         items = self._get_iterator_items()
@@ -516,10 +1189,14 @@ class TAPIClientExecutor(TAPIClient):
         if not self._resource:
             raise KeyError()
 
+        import webbrowser
+
         new = 2  # open in new tab
         webbrowser.open(self._resource["docs"], new=new)
 
     def open_in_browser(self):
+        import webbrowser
+
         new = 2  # open in new tab
         webbrowser.open(self._data, new=new)
 
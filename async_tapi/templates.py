@@ -0,0 +1,54 @@
+"""
+Request templates: the parts of a request that only depend on `api_params`
+and the resource, merged once per client and resource.
+
+The adapter builds them in `get_request_template`, the client keeps them
+until `api_params` change, e.g. after a token refresh.
+"""
+
+from types import MappingProxyType
+
+
+class RequestTemplate:
+    """
+    Immutable base of the requests to a resource: its `url`, static
+    `headers` and default query `params`. Per-call values are overlaid
+    by `apply`, which never touches the template itself.
+    """
+
+    __slots__ = ("url", "headers", "params", "_headers", "_params")
+
+    def __init__(self, url=None, headers=None, params=None):
+        # Plain dicts are merged, the read-only views are what callers see.
+        _headers = dict(headers) if headers else {}
+        _params = dict(params) if params else {}
+        for name, value in (
+            ("url", url),
+            ("headers", MappingProxyType(_headers)),
+            ("params", MappingProxyType(_params)),
+            ("_headers", _headers),
+            ("_params", _params),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RequestTemplate is immutable")
+
+    def __repr__(self):
+        return "RequestTemplate(url={!r}, headers={!r}, params={!r})".format(
+            self.url, self._headers, self._params
+        )
+
+    def apply(self, kwargs):
+        """Overlay the per-call `headers` and `params` of `kwargs` on the template."""
+        headers = kwargs.get("headers")
+        if headers:
+            kwargs["headers"] = {**self._headers, **headers}
+        elif self._headers or "headers" in kwargs:
+            kwargs["headers"] = self._headers.copy()
+        if self._params:
+            params = kwargs.get("params")
+            kwargs["params"] = (
+                {**self._params, **dict(params)} if params else self._params.copy()
+            )
+        return kwargs
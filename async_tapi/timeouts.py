@@ -0,0 +1,123 @@
+import asyncio
+import collections
+import math
+import time
+
+
+class LatencyTracker:
+    """Latencies of the last `window` requests per resource."""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._latencies = {}
+
+    def observe(self, resource_name, latency):
+        latencies = self._latencies.get(resource_name)
+        if latencies is None:
+            latencies = collections.deque(maxlen=self.window)
+            self._latencies[resource_name] = latencies
+        latencies.append(latency)
+
+    def percentile(self, resource_name, percentile, min_samples=1):
+        """Nearest-rank percentile, None until `min_samples` latencies are known."""
+        latencies = self._latencies.get(resource_name)
+        if not latencies or len(latencies) < min_samples:
+            return None
+        ordered = sorted(latencies)
+        rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def __iter__(self):
+        return iter(self._latencies)
+
+
+class AdaptiveTimeout:
+    """
+    Timeout derived from the latency observed per resource:
+    the `percentile` of the last `window` successful requests times
+    `multiplier`, clamped to [min_timeout, max_timeout] seconds.
+    Until `min_samples` latencies are known `max_timeout` is used.
+
+    client = MyClient(timeout=AdaptiveTimeout(percentile=99, multiplier=3))
+    """
+
+    def __init__(
+        self,
+        percentile=99,
+        multiplier=3.0,
+        min_timeout=1.0,
+        max_timeout=60.0,
+        window=200,
+        min_samples=20,
+    ):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker(window)
+
+    def observe(self, resource_name, latency):
+        self.latencies.observe(resource_name, latency)
+
+    def get(self, resource_name):
+        latency = self.latencies.percentile(
+            resource_name, self.percentile, self.min_samples
+        )
+        if latency is None:
+            return self.max_timeout
+        timeout = latency * self.multiplier
+        return min(max(timeout, self.min_timeout), self.max_timeout)
+
+    @property
+    def stats(self):
+        return {name: self.get(name) for name in self.latencies}
+
+
+def client_timeout(timeout, resource_name=None, remaining=None):
+    """
+    aiohttp.ClientTimeout from a number of seconds, a ClientTimeout or
+    an AdaptiveTimeout, with the total capped by the `remaining` seconds
+    of a deadline. None when there is nothing to limit.
+    """
+    if isinstance(timeout, AdaptiveTimeout):
+        timeout = timeout.get(resource_name)
+    if timeout is None and remaining is None:
+        return None
+
+    import aiohttp
+
+    if isinstance(timeout, aiohttp.ClientTimeout):
+        total = timeout.total
+        if remaining is not None:
+            total = remaining if total is None else min(total, remaining)
+        return aiohttp.ClientTimeout(
+            total=total,
+            connect=timeout.connect,
+            sock_read=timeout.sock_read,
+            sock_connect=timeout.sock_connect,
+        )
+
+    if remaining is not None:
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+class DeadlineSlot:
+    """Slot whose wait is bounded by the deadline of the call."""
+
+    __slots__ = ("slot", "deadline_at")
+
+    def __init__(self, slot, deadline_at):
+        self.slot = slot
+        self.deadline_at = deadline_at
+
+    async def __aenter__(self):
+        remaining = self.deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("Deadline of the request exceeded")
+        await asyncio.wait_for(self.slot.__aenter__(), remaining)
+        return self.slot
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return await self.slot.__aexit__(exc_type, exc_value, traceback)
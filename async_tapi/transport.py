@@ -0,0 +1,210 @@
+"""
+Transports are objects with the session interface used by the client:
+`await transport.request(method, url, **kwargs)` returning a response
+and `await transport.close()`. aiohttp.ClientSession is the default one;
+any transport can be passed to the wrapper as `session=`.
+"""
+
+import asyncio
+import collections
+import hashlib
+import json
+import re
+
+
+def request_key(method, url, params=None, data=None):
+    """
+    Key of a request: method, url, query params and body.
+    Headers are left out, they usually carry changing auth tokens.
+    """
+    if isinstance(params, dict):
+        params = sorted((str(k), str(v)) for k, v in params.items())
+    elif params is not None:
+        params = sorted((str(k), str(v)) for k, v in params)
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", "replace")
+    elif data is not None and not isinstance(data, str):
+        data = json.dumps(data, sort_keys=True, default=str)
+    raw = json.dumps([method.upper(), str(url), params, data])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class InMemoryResponse:
+    """Response with the part of the aiohttp.ClientResponse API used by the client."""
+
+    content = None
+
+    def __init__(
+        self,
+        method,
+        url,
+        status=200,
+        body=b"",
+        headers=None,
+        content_type="application/json",
+        charset="utf-8",
+    ):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+        self.content_type = content_type
+        self.charset = charset
+        if isinstance(body, str):
+            body = body.encode(charset)
+        self._body = body
+
+    def get_encoding(self):
+        return self.charset
+
+    async def read(self):
+        return self._body
+
+    async def text(self, encoding=None):
+        return self._body.decode(encoding or self.charset)
+
+    async def json(self, encoding=None, loads=json.loads, content_type=None):
+        text = self._body.decode(encoding or self.charset)
+        if not text.strip():
+            return None
+        return loads(text)
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class InMemoryRequest:
+    """Request as seen by an in-memory handler."""
+
+    def __init__(self, method, url, match=None, **kwargs):
+        self.method = method
+        self.url = url
+        self.match = match or {}
+        self.params = kwargs.get("params") or {}
+        self.headers = kwargs.get("headers") or {}
+        self.data = kwargs.get("data")
+        self.kwargs = kwargs
+
+    def json(self):
+        if self.data is None:
+            return None
+        return json.loads(self.data)
+
+
+def to_response(method, url, result):
+    """
+    Build a response from a handler result: an InMemoryResponse,
+    a (status, body) tuple, bytes/str body or JSON-serializable data.
+    """
+    if isinstance(result, InMemoryResponse):
+        return result
+    status = 200
+    if isinstance(result, tuple):
+        status, result = result
+    if isinstance(result, (bytes, str)):
+        return InMemoryResponse(method, url, status, result, content_type="text/plain")
+    return InMemoryResponse(method, url, status, json.dumps(result))
+
+
+class InMemoryTransport:
+    """
+    Routes requests to Python handlers in-process, without sockets.
+
+    transport = InMemoryTransport(latency=0.005)
+
+    @transport.route("GET", r"/user/(?P<id>\\d+)/")
+    def user(request):
+        return {"id": int(request.match["id"])}
+
+    async with MyClient(session=transport) as client:
+        ...
+
+    `latency` is a number of seconds or a callable of the request.
+    `faults` is a callable of the request or a list consumed one item per
+    request; an item is None (no fault), an exception instance to raise
+    or a handler result such as (503, "") returned instead of the handler's.
+    """
+
+    def __init__(self, handler=None, latency=0.0, faults=None):
+        self._routes = []
+        self.default_handler = handler
+        self.latency = latency
+        self.faults = faults
+        if isinstance(faults, (list, tuple)):
+            self.faults = collections.deque(faults)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def route(self, method, pattern, handler=None):
+        """Register a handler, `pattern` is searched for in the url."""
+
+        def decorator(handler):
+            self._routes.append((method.upper(), re.compile(pattern), handler))
+            return handler
+
+        if handler is not None:
+            return decorator(handler)
+        return decorator
+
+    def _resolve(self, method, url):
+        for route_method, pattern, handler in self._routes:
+            if route_method not in (method, "*"):
+                continue
+            match = pattern.search(url)
+            if match:
+                return handler, match.groupdict()
+        return self.default_handler, {}
+
+    def _fault(self, request):
+        if self.faults is None:
+            return None
+        if callable(self.faults):
+            return self.faults(request)
+        if self.faults:
+            return self.faults.popleft()
+        return None
+
+    async def _handle(self, request, handler):
+        latency = self.latency(request) if callable(self.latency) else self.latency
+        if latency:
+            await asyncio.sleep(latency)
+
+        fault = self._fault(request)
+        if isinstance(fault, BaseException):
+            raise fault
+        if fault is not None:
+            return fault
+
+        if handler is None:
+            return 404, ""
+        result = handler(request)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def request(self, method, url, **kwargs):
+        method = method.upper()
+        url = str(url)
+        handler, match = self._resolve(method, url)
+        request = InMemoryRequest(method, url, match, **kwargs)
+
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        timeout = kwargs.get("timeout")
+        timeout = getattr(timeout, "total", timeout)
+        try:
+            if timeout:
+                result = await asyncio.wait_for(self._handle(request, handler), timeout)
+            else:
+                result = await self._handle(request, handler)
+        finally:
+            self.in_flight -= 1
+        return to_response(method, url, result)
+
+    async def close(self):
+        pass
@@ -0,0 +1,49 @@
+"""
+Usage:
+    python -m tests.benchmarks --save baseline.json
+    python -m tests.benchmarks --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import sys
+
+from tests.benchmarks.suite import (
+    STAGES,
+    compare,
+    format_results,
+    load,
+    run_suite,
+    save,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    parser.add_argument("--stage", action="append", choices=sorted(STAGES))
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.stage, number=args.number, repeat=args.repeat)
+    print(format_results(results))
+
+    if args.save:
+        save(results, args.save)
+
+    if args.compare:
+        regressions = compare(load(args.compare), results, args.threshold)
+        for regression in regressions:
+            print(
+                "REGRESSION {stage}: {baseline_ns_op} -> {ns_op} ns/op "
+                "(x{ratio})".format(**regression)
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Micro-benchmarks of the pure-Python layers of the client.
+
+Every stage runs against an in-memory transport, so the numbers only
+reflect the library's own overhead.
+"""
+
+import asyncio
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from decimal import Decimal
+
+from async_tapi.exceptions import TAPIException
+from async_tapi.serializers import SimpleSerializer
+from async_tapi.transport import InMemoryResponse, InMemoryTransport
+from tests.client import TesterClient, TesterClientAdapter
+
+STAGES = {}
+
+PAYLOAD = {
+    "id": 1,
+    "name": "value",
+    "price": Decimal("10.50"),
+    "tags": ["a", "b", "c"],
+    "items": [{"sku": i, "amount": Decimal(i)} for i in range(10)],
+}
+
+
+def make_transport():
+    return InMemoryTransport(handler=lambda request: {"data": [{"key": "value"}]})
+
+
+def stage(name):
+    def decorator(factory):
+        STAGES[name] = factory
+        return factory
+
+    return decorator
+
+
+@stage("getattr")
+def bench_getattr():
+    client = TesterClient(session=make_transport())
+    return lambda: client.test
+
+
+@stage("wrap_in_tapi")
+def bench_wrap_in_tapi():
+    client = TesterClient(session=make_transport())
+    return lambda: client._wrap_in_tapi(PAYLOAD)
+
+
+@stage("native_methods")
+def bench_native_methods():
+    adapter = TesterClientAdapter()
+    return lambda: adapter.native_methods
+
+
+@stage("serialize")
+def bench_serialize():
+    serializer = SimpleSerializer()
+    return lambda: serializer.serialize(PAYLOAD)
+
+
+@stage("get_request_kwargs")
+def bench_get_request_kwargs():
+    adapter = TesterClientAdapter(serializer_class=SimpleSerializer)
+    api_params = {"headers": {"Authorization": "Bearer token"}}
+
+    def op():
+        return adapter.get_request_kwargs(
+            api_params, "POST", url="https://api.test.com/test/", data=PAYLOAD
+        )
+
+    return op
+
+
+@stage("process_response")
+def bench_process_response():
+    adapter = TesterClientAdapter()
+    response = InMemoryResponse("GET", "https://api.test.com/test/", body=b'{"a": 1}')
+
+    async def op():
+        return await adapter.process_response(response=response, request_kwargs={})
+
+    return op
+
+
+@stage("get")
+def bench_get():
+    client = TesterClient(session=make_transport())
+
+    async def op():
+        return await client.test().get()
+
+    return op
+
+
+@stage("get_error")
+def bench_get_error():
+    """Throughput of failed requests, e.g. an upstream answering 404s or 429s."""
+    transport = InMemoryTransport(handler=lambda request: (404, {"error": "missing"}))
+    client = TesterClient(session=transport)
+
+    async def op():
+        try:
+            await client.test().get()
+        except TAPIException as error:
+            return error
+
+    return op
+
+
+def _run(op, number):
+    if asyncio.iscoroutinefunction(op):
+
+        async def loop():
+            for _ in range(number):
+                await op()
+
+        asyncio.run(loop())
+    else:
+        for _ in range(number):
+            op()
+
+
+def measure_time(op, number, repeat):
+    """Best-of-`repeat` nanoseconds per call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        _run(op, number)
+        timings.append((time.perf_counter_ns() - start) / number)
+    return min(timings)
+
+
+def measure_allocations(op, number):
+    """
+    Peak of memory allocated by a single call and memory
+    still held after `number` calls, both in bytes per call.
+    """
+    _run(op, 1)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        _run(op, 1)
+        _, peak = tracemalloc.get_traced_memory()
+
+        tracemalloc.reset_peak()
+        _run(op, number)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(peak - base, 0), max(current - base, 0) / number
+
+
+def run_suite(stages=None, number=2000, repeat=5):
+    results = {}
+    for name in stages or STAGES:
+        op = STAGES[name]()
+        _run(op, min(number, 100))  # warm up
+        ns_op = measure_time(op, number, repeat)
+        peak, retained = measure_allocations(op, min(number, 200))
+        results[name] = {
+            "ns_op": round(ns_op, 1),
+            "alloc_peak_bytes": peak,
+            "alloc_retained_bytes": round(retained, 1),
+        }
+    return {
+        "python": platform.python_version(),
+        "number": number,
+        "repeat": repeat,
+        "stages": results,
+    }
+
+
+def compare(baseline, current, threshold=0.25):
+    """
+    Return the stages whose ns/op grew by more than `threshold`
+    (a fraction) relative to the baseline.
+    """
+    regressions = []
+    for name, stats in current["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or not base["ns_op"]:
+            continue
+        ratio = stats["ns_op"] / base["ns_op"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                {
+                    "stage": name,
+                    "baseline_ns_op": base["ns_op"],
+                    "ns_op": stats["ns_op"],
+                    "ratio": round(ratio, 2),
+                }
+            )
+    return regressions
+
+
+def load(path):
+    with open(path, "r", encoding="utf8") as fh:
+        return json.load(fh)
+
+
+def save(results, path):
+    with open(path, "w", encoding="utf8") as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def format_results(results):
+    lines = [
+        "{:<20} {:>12} {:>14} {:>16}".format(
+            "stage", "ns/op", "peak B", "retained B/op"
+        )
+    ]
+    for name, stats in results["stages"].items():
+        lines.append(
+            "{:<20} {:>12.1f} {:>14} {:>16.1f}".format(
+                name,
+                stats["ns_op"],
+                stats["alloc_peak_bytes"],
+                stats["alloc_retained_bytes"],
+            )
+        )
+    return "\n".join(lines)
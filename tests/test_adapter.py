@@ -1,9 +1,10 @@
 import pytest
 from aioresponses import aioresponses
 
-from async_tapi.adapters import TAPIAdapter
+from async_tapi.adapters import TAPIAdapter, generate_wrapper_from_adapter
+from async_tapi.offload import Offloader
 
-from tests.client import TesterClient
+from tests.client import TesterClient, TesterClientAdapter as ClientAdapter
 
 
 def test_fill_resource_template_url():
@@ -76,3 +77,49 @@ async def test_json_response_to_native():
             )
             response = await client.test().get()
             assert isinstance(response.data, str)
+
+
+async def test_offload_large_bodies():
+    offloader = Offloader(response_threshold=50, request_threshold=50)
+
+    class OffloadClientAdapter(ClientAdapter):
+        offload = offloader
+
+    client_class = generate_wrapper_from_adapter(OffloadClientAdapter)
+
+    async with client_class() as client:
+        with aioresponses() as mocked:
+            mocked.post(
+                client.test().data,
+                body='{"data": "%s"}' % ("x" * 100),
+                status=200,
+                content_type="application/json",
+            )
+            mocked.post(
+                client.test().data,
+                body='{"data": 1}',
+                status=200,
+                content_type="application/json",
+            )
+
+            response = await client.test().post(data={"key": "y" * 100})
+            assert response.data == {"data": "x" * 100}
+            request = list(mocked.requests.values())[0][0]
+            assert request.kwargs["data"] == '{"key": "%s"}' % ("y" * 100)
+
+            response = await client.test().post(data={"key": 1})
+            assert response.data == {"data": 1}
+
+    assert offloader.stats["decode_offloaded"] == 1
+    assert offloader.stats["decode_inline"] == 1
+    assert offloader.stats["encode_offloaded"] == 1
+    assert offloader.stats["encode_inline"] == 1
+    assert offloader.stats["max_inline_seconds"] > 0
+
+
+def test_content_to_native():
+    adapter = TAPIAdapter()
+
+    assert adapter.content_to_native(b'{"key": "value"}') == {"key": "value"}
+    assert adapter.content_to_native(b"not json") == "not json"
+    assert adapter.content_to_native(b"") is None
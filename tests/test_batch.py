@@ -0,0 +1,297 @@
+import asyncio
+
+import pytest
+
+from async_tapi.adapters import generate_wrapper_from_adapter
+from async_tapi.batch import BatchResult
+from async_tapi.exceptions import ClientError, ServerError
+from async_tapi.sync import SyncClient
+from async_tapi.transport import InMemoryTransport
+from tests.client import TesterClient, TesterClientAdapter as BaseAdapter
+
+
+def make_transport(failures, sent):
+    """Rows with an id in `failures` fail with that many 500s, then succeed."""
+    failures = dict(failures)
+
+    def handler(request):
+        row = request.json()
+        sent.append(row["id"])
+        if failures.get(row["id"]):
+            failures[row["id"]] -= 1
+            return 500, {"error": "down"}
+        if row["id"] < 0:
+            return 400, {"error": "invalid"}
+        return {"id": row["id"]}
+
+    return InMemoryTransport(handler=handler)
+
+
+async def test_partial_failure_keeps_successes():
+    sent = []
+    rows = [{"id": i} for i in range(10)]
+
+    async with TesterClient(session=make_transport({3: 1, 7: 1}, sent)) as client:
+        result = await client.test().post_batch(data=rows, concurrency=4)
+
+    assert isinstance(result, BatchResult)
+    assert len(result) == 10
+    assert set(result.errors) == {3, 7}
+    assert isinstance(result[3], ServerError) and result[3].status == 500
+    assert [r.data["id"] for i, r in enumerate(result) if i not in (3, 7)] == [
+        0,
+        1,
+        2,
+        4,
+        5,
+        6,
+        8,
+        9,
+    ]
+    assert result.succeeded == 8
+    assert result.failed == 2
+    assert result.stats["requests"] == 10
+    assert len(result.timings) == 10
+    assert all(timing >= 0 for timing in result.timings)
+    assert result.elapsed >= max(result.timings)
+    with pytest.raises(ServerError):
+        result.raise_for_errors()
+
+
+async def test_retry_failed_sends_only_failed_rows():
+    sent = []
+    rows = [{"id": i} for i in range(10)] + [{"id": -1}]
+
+    async with TesterClient(session=make_transport({3: 1, 7: 2}, sent)) as client:
+        result = await client.test().post_batch(data=rows, concurrency=4)
+        assert set(result.errors) == {3, 7, 10}
+        del sent[:]
+
+        retried = await result.retry_failed()
+        assert sorted(sent) == [-1, 3, 7]
+        assert set(retried.errors) == {7, 10}
+        assert retried[3].data == {"id": 3}
+        assert retried[0] is result[0]
+        assert isinstance(retried[10], ClientError)
+
+        del sent[:]
+        retried = await retried.retry_failed()
+        assert sorted(sent) == [-1, 7]
+        assert set(retried.errors) == {10}
+        assert retried.succeeded == 10
+
+    # The original result is left untouched.
+    assert set(result.errors) == {3, 7, 10}
+
+
+async def test_retry_failed_keeps_concurrency_and_params():
+    sent = []
+    in_flight = max_in_flight = 0
+
+    async def slow(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        sent.append((request.params.get("v"), request.json()["id"]))
+        return 500, {"error": "down"}
+
+    transport = InMemoryTransport(handler=slow)
+    async with TesterClient(session=transport) as client:
+        result = await client.test().post_batch(
+            data=[{"id": i} for i in range(6)], params={"v": 2}, semaphore=2
+        )
+        assert result.failed == 6
+        max_in_flight = 0
+        del sent[:]
+        await result.retry_failed()
+
+    assert max_in_flight == 2
+    assert sorted(sent) == [(2, i) for i in range(6)]
+
+
+async def test_failures_with_dedup_and_pack():
+    sent = []
+    rows = [{"id": 1}, {"id": 2}, {"id": 1}]
+
+    async with TesterClient(session=make_transport({1: 1}, sent)) as client:
+        result = await client.test().put_batch(data=rows, dedup=True)
+        assert set(result.errors) == {0, 2}
+        assert result[0] is result[2]
+        assert sent.count(1) == 1
+
+    class Adapter(BaseAdapter):
+        pack_max_items = 2
+
+        def build_pack_envelope(self, rows, **kwargs):
+            return {"id": rows[0]["id"], "rows": rows}
+
+        def split_pack_response(self, response_data, rows, **kwargs):
+            return rows
+
+    async with TesterClient(session=make_transport({0: 1}, sent)) as client:
+        client._api = Adapter()
+        result = await client.test().post_batch(
+            data=[{"id": i} for i in range(5)], pack=True
+        )
+        assert set(result.errors) == {0, 1}
+        assert result[2].data == {"id": 2}
+        assert len(result.timings) == 5
+
+        retried = await result.retry_failed()
+        assert retried.failed == 0
+        assert [row.data["id"] for row in retried] == [0, 1, 2, 3, 4]
+
+
+def test_sync_retry_failed():
+    sent = []
+    with SyncClient(TesterClient, session=make_transport({1: 1}, sent)) as client:
+        result = client.test().post_batch(data=[{"id": 0}, {"id": 1}])
+        assert result.failed == 1
+
+        retried = result.retry_failed()
+        assert retried.failed == 0
+        assert retried[1].data == {"id": 1}
+
+
+def make_user_transport(sent, latency=0.0):
+    transport = InMemoryTransport(latency=latency)
+
+    @transport.route("GET", r"/user/(?P<id>-?\d+)/")
+    def user(request):
+        sent.append(request)
+        if request.match["id"].startswith("-"):
+            return 404, ""
+        return {"id": int(request.match["id"]), "lang": request.params.get("lang")}
+
+    return transport
+
+
+async def test_get_batch_fills_url_and_query_params():
+    sent = []
+    rows = [{"url_params": {"id": i}, "params": {"lang": "en"}} for i in range(5)]
+    rows.append({"url_params": {"id": -1}})
+
+    async with TesterClient(session=make_user_transport(sent)) as client:
+        result = await client.user.get_batch(rows, params={"lang": "ru"}, concurrency=2)
+
+    assert [response.data for response in result[:5]] == [
+        {"id": i, "lang": "en"} for i in range(5)
+    ]
+    assert set(result.errors) == {5}
+    assert sent[5].params == {"lang": "ru"}
+
+
+async def test_iter_batch_streams_with_bounded_concurrency():
+    sent = []
+    in_flight = max_in_flight = 0
+    transport = make_user_transport(sent, latency=0.001)
+    request = transport.request
+
+    async def counting_request(*args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            return await request(*args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    transport.request = counting_request
+    rows = ({"url_params": {"id": i}} for i in range(200))
+
+    async with TesterClient(session=transport) as client:
+        seen = {}
+        async for index, response in client.user.iter_batch("GET", rows, concurrency=8):
+            seen[index] = response.data["id"]
+            # At most `concurrency` rows in flight and as many results buffered.
+            assert len(sent) - len(seen) <= 2 * 8
+
+        assert seen == {i: i for i in range(200)}
+        assert max_in_flight == 8
+
+        # Stopping early cancels the rest.
+        async for _ in client.user.iter_batch(
+            "GET", ({"url_params": {"id": i}} for i in range(1000)), concurrency=4
+        ):
+            break
+        await asyncio.sleep(0.01)
+        assert len(sent) < 220
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+        # So does closing the stream while the queue of results is full.
+        stream = client.user.iter_batch(
+            "GET", ({"url_params": {"id": i}} for i in range(100)), concurrency=3
+        )
+        for _ in range(2):
+            await stream.__anext__()
+        await asyncio.sleep(0.05)
+        await stream.aclose()
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_send_batch_retry_and_executor_rows():
+    sent = []
+    async with TesterClient(session=make_user_transport(sent)) as client:
+        result = await client.user.send_batch(
+            "GET", [{"url_params": {"id": 1}}, {"url_params": {"name": "x"}}]
+        )
+        assert isinstance(result[1], TypeError)
+        assert result.failed == 1
+
+        retried = await result.retry_failed()
+        assert isinstance(retried[1], TypeError)
+        assert retried[0] is result[0]
+
+        result = await client.user(id=2).get_batch([{"params": {"lang": "de"}}])
+        assert result[0].data == {"id": 2, "lang": "de"}
+        result = await client.user(id=2).get_batch([{"url_params": {"id": 3}}])
+        assert isinstance(result[0], TypeError)
+
+
+def test_sync_get_batch():
+    sent = []
+    with SyncClient(TesterClient, session=make_user_transport(sent)) as client:
+        result = client.user.get_batch([{"url_params": {"id": i}} for i in range(3)])
+        assert [response.data["id"] for response in result] == [0, 1, 2]
+        streamed = dict(
+            client.user.iter_batch("GET", [{"url_params": {"id": i}} for i in range(3)])
+        )
+        assert sorted(streamed) == [0, 1, 2]
+
+
+async def test_short_pack_response_fails_only_its_chunk():
+    class Adapter(BaseAdapter):
+        pack_max_items = 3
+
+        def build_pack_envelope(self, rows, **kwargs):
+            return {"id": rows[0]["id"], "rows": rows}
+
+        def split_pack_response(self, response_data, rows, **kwargs):
+            return rows[:1] if rows[0]["id"] == 0 else rows
+
+    async with TesterClient(session=make_transport({}, [])) as client:
+        client._api = Adapter()
+        result = await client.test().post_batch(
+            data=[{"id": i} for i in range(6)], pack=True
+        )
+
+    assert set(result.errors) == {0, 1, 2}
+    assert isinstance(result[0], ValueError)
+    assert [row.data["id"] for row in result[3:]] == [3, 4, 5]
+
+
+async def test_resource_named_like_a_batch_method():
+    class Adapter(BaseAdapter):
+        resource_mapping = {
+            **BaseAdapter.resource_mapping,
+            "get_batch": {"resource": "get-batch/", "docs": ""},
+        }
+
+    sent = []
+    client = generate_wrapper_from_adapter(Adapter)(session=make_user_transport(sent))
+    assert client.get_batch().data == "https://api.test.com/get-batch/"
+
+    result = await client.user.send_batch("GET", [{"url_params": {"id": 1}}])
+    assert result[0].data["id"] == 1
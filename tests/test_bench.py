@@ -0,0 +1,40 @@
+from async_tapi.bench import BenchClient, percentile, run
+from tests.client import TesterClient
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+async def test_run_scenarios_against_stub_server():
+    reports = await run(
+        BenchClient,
+        ["get", "post_batch", "iter_items"],
+        server_options={"pages": 3, "page_size": 2},
+        requests=10,
+        concurrency=2,
+    )
+
+    by_scenario = {report["scenario"]: report for report in reports}
+    assert by_scenario["get"]["requests"] == 10
+    assert by_scenario["post_batch"]["requests"] == 10
+    # two concurrent walks over three pages
+    assert by_scenario["iter_items"]["requests"] == 6
+    for report in reports:
+        assert report["errors"] == 0
+        assert report["p50_ms"] <= report["p95_ms"] <= report["p99_ms"]
+
+
+async def test_run_with_custom_wrapper_counts_errors():
+    reports = await run(
+        TesterClient,
+        ["get"],
+        server_options={"error_rate": 1.0},
+        requests=5,
+        concurrency=1,
+    )
+
+    assert reports[0]["errors"] == 5
@@ -0,0 +1,27 @@
+from tests.benchmarks.suite import STAGES, compare, run_suite
+
+
+def test_suite_reports_every_stage():
+    results = run_suite(number=5, repeat=1)
+
+    assert set(results["stages"]) == set(STAGES)
+    for stats in results["stages"].values():
+        assert stats["ns_op"] > 0
+        assert stats["alloc_peak_bytes"] >= 0
+        assert stats["alloc_retained_bytes"] >= 0
+
+
+def test_compare_detects_regression():
+    baseline = {"stages": {"get": {"ns_op": 100.0}, "getattr": {"ns_op": 100.0}}}
+    current = {
+        "stages": {
+            "get": {"ns_op": 200.0},
+            "getattr": {"ns_op": 110.0},
+            "new_stage": {"ns_op": 1.0},
+        }
+    }
+
+    regressions = compare(baseline, current, threshold=0.25)
+
+    assert [r["stage"] for r in regressions] == ["get"]
+    assert regressions[0]["ratio"] == 2.0
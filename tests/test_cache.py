@@ -0,0 +1,158 @@
+import multiprocessing
+import sqlite3
+import time
+
+from async_tapi.cache import SQLiteCache
+from async_tapi.transport import InMemoryResponse, InMemoryTransport, request_key
+from tests.client import TesterClient
+
+
+def make_transport():
+    counter = iter(range(1000))
+    return InMemoryTransport(handler=lambda request: {"n": next(counter)})
+
+
+async def test_get_is_served_from_cache(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    transport = make_transport()
+
+    async with TesterClient(session=transport, cache=cache) as client:
+        first = await client.test().get(params={"a": 1})
+        second = await client.test().get(params={"a": 1})
+        other = await client.test().get(params={"a": 2})
+        bypassed = await client.test().get(params={"a": 1}, cache=False)
+
+        assert first.data == second.data == {"n": 0}
+        assert other.data == {"n": 1}
+        assert bypassed.data == {"n": 2}
+        assert second.status == 200
+        assert transport.requests == 3
+        assert client.stats["cache_hits"] == 1
+        assert client.stats["cache_misses"] == 2
+
+    cache.close()
+
+
+async def test_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    async with TesterClient(
+        session=make_transport(), cache=SQLiteCache(path)
+    ) as client:
+        await client.test().get()
+
+    transport = make_transport()
+    async with TesterClient(session=transport, cache=SQLiteCache(path)) as client:
+        response = await client.test().get()
+
+    assert response.data == {"n": 0}
+    assert transport.requests == 0
+
+
+async def test_entries_are_not_shared_across_credentials(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    transport = make_transport()
+
+    for token in ("alice", "bob", "alice"):
+        async with TesterClient(
+            session=transport, cache=cache, headers={"Authorization": token}
+        ) as client:
+            response = await client.test().get()
+        assert response.data == {"n": 0 if token == "alice" else 1}
+    assert transport.requests == 2
+
+    other = SQLiteCache(str(tmp_path / "cache.sqlite"), namespace="tenant")
+    async with TesterClient(
+        session=transport, cache=other, headers={"Authorization": "alice"}
+    ) as client:
+        assert (await client.test().get()).data == {"n": 2}
+    assert cache.key("GET", "http://a", headers={"X-Api-Key": "1"}) != cache.key(
+        "GET", "http://a", headers={"x-api-key": "2"}
+    )
+    cache.close()
+    other.close()
+
+
+async def test_only_successful_gets_are_cached(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    transport = make_transport()
+
+    async with TesterClient(session=transport, cache=cache) as client:
+        await client.test().post(data={"a": 1})
+        await client.test().post(data={"a": 1})
+
+    assert transport.requests == 2
+    assert len(cache) == 0
+
+
+async def test_ttl(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), ttl=0.05)
+    key = request_key("GET", "http://a")
+    await cache.set(key, InMemoryResponse("GET", "http://a", body=b"{}"))
+
+    assert await cache.get(key) is not None
+    time.sleep(0.1)
+    assert await cache.get(key) is None
+    assert len(cache) == 0
+
+
+async def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_size=25)
+    for name in "abc":
+        await cache.set(name, InMemoryResponse("GET", name, body=b"x" * 10))
+        time.sleep(0.01)
+        if name == "b":
+            # Touch "a", so "b" becomes the least recently used one.
+            await cache.get("a")
+
+    assert await cache.get("a") is not None
+    assert await cache.get("b") is None
+    assert await cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+async def test_reads_do_not_take_the_write_lock(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path, max_size=25, timeout=0.1)
+    await cache.set("a", InMemoryResponse("GET", "a", body=b"x" * 10))
+    # Replacing an entry keeps the tracked total size right.
+    await cache.set("a", InMemoryResponse("GET", "a", body=b"x" * 10))
+    await cache.set("b", InMemoryResponse("GET", "b", body=b"x" * 10))
+    assert cache.evictions == 0
+    time.sleep(0.01)
+
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert await cache.get("a") is not None
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    await cache.set("c", InMemoryResponse("GET", "c", body=b"x" * 10))
+    assert cache.evictions == 1
+    assert await cache.get("a") is not None
+    assert await cache.get("b") is None
+    cache.close()
+
+
+def _fill(path, worker):
+    cache = SQLiteCache(path)
+    for i in range(50):
+        cache.set_sync(
+            "{}-{}".format(worker, i), "GET", "http://a", 200, {}, None, None, b"x"
+        )
+    cache.close()
+
+
+def test_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteCache(path).close()
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_fill, args=(path, n)) for n in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert len(SQLiteCache(path)) == 200
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from async_tapi.cassette import CassetteMiss, RecordingTransport, ReplayTransport
+from async_tapi.transport import InMemoryTransport, request_key
+from tests.client import TesterClient
+
+
+def test_request_key_ignores_params_order():
+    assert request_key("get", "http://a", {"a": 1, "b": 2}) == request_key(
+        "GET", "http://a", {"b": 2, "a": 1}
+    )
+    assert request_key("GET", "http://a", data='{"a": 1}') != request_key(
+        "GET", "http://a", data='{"a": 2}'
+    )
+
+
+async def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "capture.cassette")
+    counter = iter(range(100))
+    upstream = InMemoryTransport(
+        handler=lambda request: {"n": next(counter)}, latency=0.02
+    )
+
+    async with TesterClient(session=RecordingTransport(upstream, path)) as client:
+        await client.test().get(params={"page": 1})
+        await client.test().get(params={"page": 1})
+        await client.user(id=1).post(data={"name": "x"})
+
+    replay = ReplayTransport(path)
+    assert len(replay) == 3
+    async with TesterClient(session=replay) as client:
+        first = await client.test().get(params={"page": 1})
+        second = await client.test().get(params={"page": 1})
+        third = await client.test().get(params={"page": 1})
+        created = await client.user(id=1).post(data={"name": "x"})
+
+        assert [first.data, second.data, third.data] == [{"n": 0}, {"n": 1}, {"n": 1}]
+        assert created.data == {"n": 2}
+        assert created.status == 200
+
+        with pytest.raises(CassetteMiss):
+            await client.user(id=2).post(data={"name": "x"})
+
+    assert replay.misses == 1
+
+
+async def test_replay_scaled_timing(tmp_path):
+    path = str(tmp_path / "capture.cassette")
+    upstream = InMemoryTransport(handler=lambda request: {}, latency=0.05)
+    async with TesterClient(session=RecordingTransport(upstream, path)) as client:
+        await client.test().get()
+
+    async with TesterClient(session=ReplayTransport(path, timing_scale=0.5)) as client:
+        start = time.monotonic()
+        await client.test().get()
+        elapsed = time.monotonic() - start
+
+    assert 0.02 < elapsed < 0.05
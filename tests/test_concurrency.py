@@ -0,0 +1,166 @@
+import asyncio
+from urllib.parse import urlsplit
+
+from async_tapi.concurrency import (
+    AdaptiveConcurrency,
+    ConcurrencyLimiter,
+    ConcurrencyLimits,
+)
+from async_tapi.transport import InMemoryTransport
+from tests.client import TesterClient
+
+
+def make_transport(latency=0.01, faults=None):
+    return InMemoryTransport(handler=lambda request: {}, latency=latency, faults=faults)
+
+
+async def test_batch_semaphore_bounds_requests_in_flight():
+    session = make_transport()
+    async with TesterClient(session=session) as client:
+        results = await client.test().post_batch(data=[{}] * 10, semaphore=3)
+
+    assert len(results) == 10
+    assert session.max_in_flight == 3
+
+
+async def test_limiter_hands_slots_to_waiters_in_order():
+    limiter = ConcurrencyLimiter(1)
+    order = []
+
+    async def task(name):
+        await limiter.acquire()
+        order.append(name)
+        await asyncio.sleep(0)
+        limiter.release()
+
+    await asyncio.gather(*[task(i) for i in range(5)])
+
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.in_flight == 0
+
+
+async def test_cancelled_waiter_does_not_leak_slot():
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    limiter.release()
+    await asyncio.sleep(0)
+
+    assert limiter.in_flight == 0
+
+
+def test_aimd_grows_additively_and_cuts_multiplicatively():
+    controller = AdaptiveConcurrency(min_limit=1, max_limit=8, initial_limit=4)
+
+    for _ in range(4):
+        controller.in_flight += 1
+        controller.release(latency=0.01, status=200)
+    assert 4.9 < controller.limit < 5.0
+
+    controller.in_flight += 1
+    controller.release(latency=0.01, status=429)
+    assert 2.4 < controller.limit < 2.5
+    assert controller.stats["decreases"] == 1
+
+
+def test_aimd_cuts_on_latency_spike_and_respects_bounds():
+    controller = AdaptiveConcurrency(min_limit=2, max_limit=3, initial_limit=3)
+
+    for _ in range(10):
+        controller.in_flight += 1
+        controller.release(latency=0.01, status=200)
+    assert controller.limit == 3
+
+    controller._last_decrease = 0
+    controller.in_flight += 1
+    controller.release(latency=1.0, status=200)
+    assert controller.limit == 2
+
+
+async def test_batch_with_adaptive_concurrency_backs_off():
+    session = make_transport(latency=0, faults=[(503, "")] * 4)
+    controller = AdaptiveConcurrency(min_limit=1, max_limit=10, initial_limit=8)
+    async with TesterClient(session=session) as client:
+        result = await client.test().post_batch(data=[{}] * 4, concurrency=controller)
+
+    assert result.failed == 4
+    assert all(error.status == 503 for error in result.errors.values())
+    assert controller.stats["decreases"] >= 1
+    assert controller.limit < 8
+
+
+async def test_batch_accepts_asyncio_semaphore():
+    session = make_transport()
+    semaphore = asyncio.Semaphore(2)
+    async with TesterClient(session=session) as client:
+        results = await client.test().post_batch(data=[{}] * 6, semaphore=semaphore)
+
+    assert results.succeeded == 6
+    assert session.max_in_flight == 2
+    assert not semaphore.locked()
+
+
+async def test_client_limit_is_shared_by_every_call():
+    session = make_transport()
+    async with TesterClient(session=session, concurrency=3) as client:
+        resource = client.test
+        await asyncio.gather(
+            *[client.test().get() for _ in range(5)],
+            *[resource().post(data={}) for _ in range(5)],
+            client.test().post_batch(data=[{}] * 5),
+            client.user.get_batch([{"url_params": {"id": i}} for i in range(5)]),
+        )
+
+    assert session.requests == 20
+    assert session.max_in_flight == 3
+
+
+async def test_per_host_and_per_resource_limits():
+    session = make_transport()
+    in_flight = {}
+    peaks = {}
+    request = session.request
+
+    async def counting_request(method, url, **kwargs):
+        parts = urlsplit(url)
+        keys = (parts.netloc, parts.path.split("/")[1])
+        for key in keys:
+            in_flight[key] = in_flight.get(key, 0) + 1
+            peaks[key] = max(peaks.get(key, 0), in_flight[key])
+        try:
+            return await request(method, url, **kwargs)
+        finally:
+            for key in keys:
+                in_flight[key] -= 1
+
+    session.request = counting_request
+    limits = ConcurrencyLimits(limit=10, per_host=4, per_resource={"user": 1})
+    async with TesterClient(session=session, concurrency=limits) as client:
+        await asyncio.gather(
+            *[client.test().get() for _ in range(10)],
+            *[client.user(id=i).get() for i in range(5)],
+            *[client.another_root().get() for _ in range(10)],
+        )
+
+    assert peaks["user"] == 1
+    assert peaks["api.test.com"] == 4
+    assert peaks["api.another.com"] == 4
+    assert session.max_in_flight == 8
+    assert limits.stats["resources"]["user"] == {"limit": 1, "in_flight": 0}
+    assert set(limits.stats["hosts"]) == {"api.test.com", "api.another.com"}
+    assert limits.stats["limit"]["in_flight"] == 0
+
+
+async def test_adaptive_client_limit_backs_off():
+    session = make_transport(latency=0, faults=[(503, "")] * 4)
+    controller = AdaptiveConcurrency(min_limit=1, max_limit=10, initial_limit=8)
+    async with TesterClient(session=session, concurrency=controller) as client:
+        results = await asyncio.gather(
+            *[client.test().get() for _ in range(4)], return_exceptions=True
+        )
+
+    assert len(results) == 4
+    assert controller.decreases >= 1
+    assert controller.in_flight == 0
@@ -4,15 +4,16 @@ from aioresponses import aioresponses
 
 from async_tapi.exceptions import (
     ClientError,
+    NotFound404Error,
     ServerError,
     ResponseProcessException,
     TAPIException,
 )
 from async_tapi.tapi import TAPIClient
+from async_tapi.transport import InMemoryTransport
 
 from tests.client import TesterClient, TesterClientAdapter as ClientAdapter
 
-
 """
 test TAPIException
 """
@@ -121,3 +122,66 @@ async def test_raises_server_error():
             mocked.get(client.test().data, status=500, content_type="application/json")
             with pytest.raises(ServerError):
                 await client.test().get()
+
+
+async def test_exception_client_is_built_on_access():
+    transport = InMemoryTransport(handler=lambda request: (404, {"error": "missing"}))
+    async with TesterClient(session=transport) as client:
+        with pytest.raises(TAPIException) as info:
+            await client.test().get()
+
+    exception = info.value
+    assert exception.status == 404
+    assert exception.data is None
+    assert exception._client.__class__ is not TAPIClient
+
+    assert exception.client.__class__ is TAPIClient
+    assert exception.client is exception.client
+    assert exception.client().status == 404
+
+
+async def test_error_hooks_receive_client():
+    seen = []
+
+    class Adapter(ClientAdapter):
+        def retry_request(self, tapi_exception, error_message, repeat_number, **kwargs):
+            client = kwargs["client"]
+            seen.append((client.status, client.data, client().status, error_message))
+            return False
+
+    transport = InMemoryTransport(handler=lambda request: (400, {"error": "bad"}))
+    async with TesterClient(session=transport) as client:
+        client._api = Adapter()
+        with pytest.raises(ClientError):
+            await client.test().get()
+
+    assert seen == [(400, {"error": "bad"}, 400, "bad")]
+
+
+async def test_fixed_message_errors_skip_the_body():
+    decoded = []
+
+    class Adapter(ClientAdapter):
+        async def response_to_native(self, response):
+            decoded.append(response.status)
+            return await super().response_to_native(response)
+
+    class RetryingAdapter(Adapter):
+        def retry_request(self, tapi_exception, error_message, repeat_number, **kwargs):
+            decoded.append(error_message)
+            return False
+
+    transport = InMemoryTransport(handler=lambda request: (404, {"error": "missing"}))
+    async with TesterClient(session=transport) as client:
+        client._api = Adapter()
+        with pytest.raises(NotFound404Error) as info:
+            await client.test().get()
+        assert str(info.value) == "Error 404 page not found"
+        assert decoded == []
+
+        # A hook that receives the message still gets it from the body.
+        client._api = RetryingAdapter()
+        with pytest.raises(NotFound404Error) as info:
+            await client.test().get()
+        assert str(info.value) == "missing"
+        assert decoded == [404, "missing"]
@@ -0,0 +1,104 @@
+import asyncio
+import itertools
+import time
+
+from async_tapi.hedging import Hedging
+from async_tapi.transport import InMemoryTransport
+from tests.client import TesterClient
+
+
+def make_transport(latencies):
+    """Transport whose n-th request takes latencies[n] seconds, the last one repeats."""
+    counter = itertools.count()
+
+    def latency(request):
+        return latencies[min(next(counter), len(latencies) - 1)]
+
+    return InMemoryTransport(handler=lambda request: {"ok": True}, latency=latency)
+
+
+async def test_slow_request_is_hedged():
+    transport = make_transport([0.5, 0.01])
+    hedging = Hedging(delay=0.02, budget=1)
+
+    async with TesterClient(session=transport, hedging=hedging) as client:
+        start = time.monotonic()
+        response = await client.test().get()
+        elapsed = time.monotonic() - start
+        await asyncio.sleep(0)  # let the cancelled request unwind
+
+    assert response.data == {"ok": True}
+    assert elapsed < 0.2
+    assert transport.requests == 2
+    assert transport.in_flight == 0  # the slow request was cancelled
+    assert hedging.stats == {
+        "requests": 1,
+        "hedges": 1,
+        "hedge_wins": 1,
+        "hedge_rate": 1.0,
+    }
+
+
+async def test_fast_request_is_not_hedged():
+    transport = make_transport([0.001])
+    hedging = Hedging(delay=0.05, budget=1)
+
+    async with TesterClient(session=transport, hedging=hedging) as client:
+        for _ in range(3):
+            await client.test().get()
+        await client.test().get(hedge=False)
+        await client.test().post(data={})
+
+    assert transport.requests == 5
+    assert hedging.requests == 3
+    assert hedging.hedges == 0
+
+
+async def test_hedge_budget():
+    transport = make_transport([0.05])
+    hedging = Hedging(delay=0.01, budget=0.25)
+
+    async with TesterClient(session=transport, hedging=hedging) as client:
+        for _ in range(8):
+            await client.test().get()
+
+    assert hedging.hedges == 2
+    assert transport.requests == 10
+
+
+async def test_delay_from_observed_percentile():
+    transport = make_transport([0.01] * 5 + [0.5, 0.01])
+    hedging = Hedging(percentile=95, min_samples=5, budget=1)
+
+    async with TesterClient(session=transport, hedging=hedging) as client:
+        for _ in range(5):
+            await client.test().get()
+        assert hedging.hedges == 0
+        assert 0.01 <= hedging.get_delay("test") < 0.05
+
+        start = time.monotonic()
+        await client.test().get()
+        assert time.monotonic() - start < 0.2
+
+    assert hedging.hedges == 1
+    assert hedging.hedge_wins == 1
+
+
+async def test_hedge_takes_a_concurrency_slot():
+    transport = make_transport([0.05])
+    hedging = Hedging(delay=0.01, budget=1)
+
+    async with TesterClient(
+        session=transport, hedging=hedging, concurrency=2
+    ) as client:
+        await client.test().get()
+        assert hedging.hedges == 1
+        assert transport.max_in_flight == 2
+
+        # Both slots are busy with primary requests, none is left to hedge.
+        await asyncio.gather(client.test().get(), client.test().get())
+        await asyncio.sleep(0)
+
+    assert hedging.hedges == 1
+    assert transport.max_in_flight == 2
+    assert client._limits.stats["limit"]["in_flight"] == 0
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+
+import async_tapi
+
+# Budget of the wall time of `import async_tapi` with warm bytecode, as
+# a multiple of `import asyncio` on the same machine: importing aiohttp
+# alone costs well over twice that.
+IMPORT_TIME_RATIO = 2.0
+
+# Absolute budget in seconds, e.g. 0.12, checked on top of the ratio when set.
+IMPORT_TIME_BUDGET = os.environ.get("ASYNC_TAPI_IMPORT_TIME_BUDGET")
+
+DEFERRED_MODULES = ["aiohttp", "webbrowser", "pprint", "sqlite3", "multiprocessing"]
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {modules!r} if name in sys.modules]]))
+"""
+
+
+def measure_import(tmp_path, module="async_tapi"):
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(tmp_path))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(async_tapi.__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(module=module, modules=DEFERRED_MODULES)],
+        cwd=root,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def test_import_defers_optional_modules(tmp_path):
+    _, loaded = measure_import(tmp_path)
+    assert loaded == []
+
+
+def test_import_time_budget(tmp_path):
+    measure_import(tmp_path)  # writes the bytecode cache
+    elapsed = min(measure_import(tmp_path)[0] for _ in range(3))
+    baseline = min(measure_import(tmp_path, "asyncio")[0] for _ in range(3))
+    assert elapsed < IMPORT_TIME_RATIO * baseline
+    if IMPORT_TIME_BUDGET:
+        assert elapsed < float(IMPORT_TIME_BUDGET)
+
+
+def test_lazy_attributes():
+    from async_tapi.cache import SQLiteCache
+
+    assert async_tapi.SQLiteCache is SQLiteCache
+    assert "Hedging" in dir(async_tapi)
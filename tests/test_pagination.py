@@ -0,0 +1,82 @@
+import gc
+import json
+import tracemalloc
+import weakref
+from urllib.parse import parse_qs, urlsplit
+
+from async_tapi.state import Checkpoint, MemoryStateStore
+from async_tapi.transport import InMemoryResponse, InMemoryTransport
+from tests.client import TesterClient
+
+PAGE_SIZE = 20
+
+
+def make_transport(pages, responses=None):
+    transport = InMemoryTransport()
+
+    @transport.route("GET", r"/test/")
+    def page(request):
+        number = int(parse_qs(urlsplit(request.url).query).get("page", [0])[0])
+        data = {"data": [{"value": "x" * 100} for _ in range(PAGE_SIZE)]}
+        if number + 1 < pages:
+            data["paging"] = {
+                "next": "https://api.test.com/test/?page={}".format(number + 1)
+            }
+        if responses is None:
+            return data
+        response = InMemoryResponse(request.method, request.url, body=json.dumps(data))
+        responses.append(weakref.ref(response))
+        return response
+
+    return transport
+
+
+async def walk(method, pages):
+    async with TesterClient(session=make_transport(pages)) as client:
+        count = 0
+        if method == "resume_items":
+            walk = client.test().resume_items(Checkpoint(MemoryStateStore(), "test"))
+        else:
+            response = await client.test().get()
+            walk = getattr(response(), method)()
+            response = None
+        async for _ in walk:
+            count += 1
+        return count
+
+
+async def peak_memory(method, pages):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        count = await walk(method, pages)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == pages * PAGE_SIZE
+    return peak
+
+
+async def test_memory_is_flat_over_pages():
+    for method in ("iter_items", "pages", "resume_items"):
+        short = await peak_memory(method, 100)
+        long = await peak_memory(method, 2000)
+        assert long < short * 1.2, method
+
+
+async def test_consumed_pages_are_released():
+    responses = []
+    transport = make_transport(20, responses)
+    checkpoint = Checkpoint(MemoryStateStore(), "test")
+
+    async with TesterClient(session=transport) as client:
+        async for _ in client.test().resume_items(checkpoint):
+            alive = [ref() is not None for ref in responses]
+            assert alive == [False] * (len(responses) - 1) + [True]
+
+        response = await client.test().get()
+        first = len(responses) - 1
+        async for _ in response().iter_items():
+            alive = [i for i, ref in enumerate(responses) if ref() is not None]
+            # The first page is held by the caller.
+            assert alive[0] == first and len(alive) <= 2
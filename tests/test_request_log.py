@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+
+from async_tapi.exceptions import NotFound404Error
+from async_tapi.request_log import RequestLogger
+from async_tapi.transport import InMemoryTransport
+from tests.client import TesterClient
+
+
+def make_transport(latency=0.0):
+    transport = InMemoryTransport(latency=latency)
+    transport.route("GET", r"/test/", lambda request: {"data": "x" * 50})
+    return transport
+
+
+async def test_debug_logs_request(caplog):
+    caplog.set_level(logging.DEBUG, logger="async_tapi")
+
+    async with TesterClient(
+        session=make_transport(), headers={"Authorization": "secret"}
+    ) as client:
+        await client.test().get(params={"a": 1}, debug=True)
+        await client.test().get()
+
+    (record,) = caplog.records
+    assert record.levelno == logging.DEBUG
+    assert record.request["method"] == "GET"
+    assert record.request["url"] == "https://api.test.com/test/"
+    assert record.request["params"] == {"a": 1}
+    assert record.request["status"] == 200
+    assert record.request["headers"]["Authorization"] == "***"
+    assert "secret" not in record.getMessage()
+    assert "x" * 50 in record.getMessage()
+
+
+async def test_debug_logs_request_without_logging_configured(caplog):
+    async with TesterClient(session=make_transport()) as client:
+        await client.test().get(debug=True)
+        await client.test().get()
+
+    (record,) = caplog.records
+    assert record.levelno == logging.WARNING
+    assert record.request["url"] == "https://api.test.com/test/"
+
+
+async def test_body_truncation_and_laziness(caplog):
+    caplog.set_level(logging.DEBUG, logger="async_tapi")
+    request_logger = RequestLogger(max_body=10)
+
+    async with TesterClient(
+        session=make_transport(), request_logger=request_logger
+    ) as client:
+        await client.test().get()
+        assert caplog.records[0].getMessage().endswith("{'data': '... (62 chars)")
+
+        # Nothing is formatted, nor lazy bodies decoded, when the level is off.
+        caplog.set_level(logging.INFO, logger="async_tapi")
+        response = await client.test().get(lazy=True)
+        assert response._content is not None
+
+    assert len(caplog.records) == 1
+
+
+async def test_slow_threshold_and_sampling(caplog):
+    caplog.set_level(logging.DEBUG, logger="async_tapi")
+    slow = RequestLogger(slow_threshold=30)
+
+    async with TesterClient(session=make_transport(), request_logger=slow) as client:
+        await client.test().get()
+    async with TesterClient(
+        session=make_transport(latency=0.04), request_logger=slow
+    ) as client:
+        await client.test().get()
+    assert len(caplog.records) == 1
+    assert caplog.records[0].request["elapsed_ms"] >= 30
+
+    silent = RequestLogger(sample_rate=0)
+    async with TesterClient(session=make_transport(), request_logger=silent) as client:
+        for _ in range(10):
+            await client.test().get()
+        await client.test().get(debug=True)
+    assert len(caplog.records) == 2
+
+
+async def test_errors_are_logged(caplog):
+    caplog.set_level(logging.DEBUG, logger="async_tapi")
+
+    async with TesterClient(
+        session=make_transport(), request_logger=RequestLogger(slow_threshold=1000)
+    ) as client:
+        with pytest.raises(NotFound404Error):
+            await client.user(id=1).get()
+
+    (record,) = caplog.records
+    assert record.levelno == logging.WARNING
+    assert record.request["status"] == 404
+    assert record.request["url"] == "https://api.test.com/user/1/"
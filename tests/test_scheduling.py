@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+
+from async_tapi.adapters import Resource
+from async_tapi.concurrency import ConcurrencyLimits
+from async_tapi.scheduling import RequestScheduler
+from async_tapi.transport import InMemoryTransport
+from tests.client import TesterClient
+
+
+async def _dispatch_order(scheduler, priorities):
+    order = []
+    await scheduler.acquire("default")
+
+    async def request(index, priority):
+        async with scheduler.slot(priority):
+            order.append(index)
+
+    tasks = [
+        asyncio.ensure_future(request(index, priority))
+        for index, priority in enumerate(priorities)
+    ]
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def test_interactive_requests_jump_ahead_of_bulk():
+    scheduler = RequestScheduler(max_concurrency=1)
+    order = await _dispatch_order(scheduler, ["bulk"] * 5 + ["interactive"])
+
+    assert order[0] == 5
+    assert order[1:] == [0, 1, 2, 3, 4]
+
+
+async def test_bulk_is_not_starved():
+    scheduler = RequestScheduler(max_concurrency=1)
+    priorities = ["bulk"] * 3 + ["interactive"] * 20
+    order = await _dispatch_order(scheduler, priorities)
+
+    # weights 8:1, so one bulk request per eight interactive ones
+    assert 0 in order[:9]
+    assert 1 in order[:18]
+    assert scheduler.stats["priorities"]["bulk"]["dispatched"] == 3
+    assert scheduler.in_flight == 0
+
+
+async def test_unknown_priority():
+    scheduler = RequestScheduler()
+    with pytest.raises(ValueError):
+        await scheduler.acquire("urgent")
+
+
+async def test_client_uses_scheduler_with_resource_default_priority():
+    scheduler = RequestScheduler(max_concurrency=2)
+    resource_mapping = [Resource("export", "export/", priority="bulk")]
+    session = InMemoryTransport(handler=lambda request: {})
+    async with TesterClient(
+        session=session, scheduler=scheduler, resource_mapping=resource_mapping
+    ) as client:
+        await client.export().post_batch(data=[{}] * 3)
+        await client.test().get(priority="interactive")
+
+    priorities = scheduler.stats["priorities"]
+    assert priorities["bulk"]["dispatched"] == 3
+    assert priorities["interactive"]["dispatched"] == 1
+    assert session.max_in_flight <= 2
+
+
+async def test_requests_waiting_for_a_limit_do_not_hold_scheduler_slots():
+    scheduler = RequestScheduler(max_concurrency=10)
+    limits = ConcurrencyLimits(per_resource={"test": 2})
+    session = InMemoryTransport(
+        handler=lambda request: {},
+        latency=lambda request: 0.2 if "/test/" in str(request.url) else 0.01,
+    )
+    async with TesterClient(
+        session=session, scheduler=scheduler, concurrency=limits
+    ) as client:
+        bulk = asyncio.ensure_future(
+            client.test().post_batch(data=[{}] * 40, priority="bulk")
+        )
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        await client.user(id=1).get(priority="interactive")
+        elapsed = time.monotonic() - start
+        bulk.cancel()
+        await asyncio.gather(bulk, return_exceptions=True)
+
+    assert elapsed < 0.15
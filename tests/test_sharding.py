@@ -0,0 +1,70 @@
+import pickle
+
+import pytest
+
+from async_tapi.adapters import TAPIAdapter, generate_wrapper_from_adapter
+from async_tapi.bench import StubServer
+from async_tapi.sharding import RowError, SharedRateLimiter, ShardedBatchExecutor
+
+
+class StubClientAdapter(TAPIAdapter):
+    resource_mapping = {"items": {"resource": "items"}}
+
+    def get_api_root(self, api_params, resource_name):
+        return api_params["api_root"]
+
+
+StubClient = generate_wrapper_from_adapter(StubClientAdapter)
+
+
+@pytest.fixture
+async def stub():
+    server = StubServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+async def test_results_come_back_in_input_order(stub):
+    rows = [{"id": i} for i in range(20)]
+    with ShardedBatchExecutor(
+        StubClient, workers=3, client_params={"api_root": stub.url}
+    ) as pool:
+        result = await pool.run_async("POST", "items", rows)
+
+    assert len(result) == 20
+    assert result.results == [{"data": {"ok": True}}] * 20
+    assert result.statuses == [200] * 20
+    assert result.errors == {}
+    assert sum(shard["rows"] for shard in result.stats["shards"]) == 20
+    assert stub.requests == 20
+
+
+async def test_errors_are_reported_per_row(stub):
+    stub.error_rate = 1.0
+    with ShardedBatchExecutor(
+        StubClient, workers=2, client_params={"api_root": stub.url}
+    ) as pool:
+        result = await pool.run_async("PUT", "items", [{"id": 1}, {"id": 2}])
+
+    assert result.results == [None, None]
+    assert set(result.errors) == {0, 1}
+    assert result.errors[0].error_type == "ServerError"
+    assert result.errors[0].status == 500
+    assert result.stats["errors"] == 2
+
+
+def test_row_error_is_picklable():
+    error = pickle.loads(pickle.dumps(RowError("ClientError", "bad", 400)))
+    assert (error.error_type, error.message, error.status) == (
+        "ClientError",
+        "bad",
+        400,
+    )
+
+
+def test_shared_rate_limiter_spaces_requests():
+    limiter = SharedRateLimiter(rate=10)
+    delays = [limiter.reserve() for _ in range(5)]
+    assert delays[0] == pytest.approx(0, abs=0.01)
+    assert delays[-1] == pytest.approx(0.4, abs=0.05)
@@ -0,0 +1,149 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from async_tapi.adapters import generate_wrapper_from_adapter
+from async_tapi.state import (
+    Checkpoint,
+    JSONFileStateStore,
+    MemoryStateStore,
+    Watermark,
+)
+from async_tapi.transport import InMemoryTransport
+from tests.client import TesterClient
+from tests.client import TesterClientAdapter as BaseAdapter
+
+PAGES = 5
+PAGE_SIZE = 3
+
+
+def make_transport():
+    transport = InMemoryTransport()
+
+    @transport.route("GET", r"/test/")
+    def page(request):
+        query = parse_qs(urlsplit(request.url).query)
+        number = int(query.get("page", [0])[0])
+        data = {"data": list(range(number * PAGE_SIZE, (number + 1) * PAGE_SIZE))}
+        if number + 1 < PAGES:
+            data["paging"] = {
+                "next": "https://api.test.com/test/?page={}".format(number + 1)
+            }
+        return data
+
+    return transport
+
+
+def test_json_file_store(tmp_path):
+    path = str(tmp_path / "state.json")
+    store = JSONFileStateStore(path)
+    assert store.get("a") is None
+
+    store.set("a", {"x": 1})
+    store.set("b", 2)
+    store.delete("b")
+
+    assert JSONFileStateStore(path).get("a") == {"x": 1}
+    with open(path) as fh:
+        assert json.load(fh) == {"a": {"x": 1}}
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+async def test_resume_after_crash(tmp_path):
+    checkpoint = Checkpoint(JSONFileStateStore(str(tmp_path / "state.json")), "test")
+    transport = make_transport()
+
+    seen = []
+    async with TesterClient(session=transport) as client:
+        async for item in client.test().resume_items(checkpoint):
+            seen.append(item)
+            if item == 7:
+                break  # crash in the middle of the third page
+
+    assert checkpoint.load()["pages"] == 2
+    assert checkpoint.load()["items"] == 6
+
+    async with TesterClient(session=transport) as client:
+        resumed = [item async for item in client.test().resume_items(checkpoint)]
+
+    assert resumed == list(range(6, PAGES * PAGE_SIZE))
+    assert transport.requests == 3 + 3
+    assert checkpoint.load() is None
+
+
+async def test_iter_items_checkpoint_and_limits():
+    checkpoint = Checkpoint(MemoryStateStore(), "test")
+
+    async with TesterClient(session=make_transport()) as client:
+        response = await client.test().get()
+        items = [
+            item
+            async for item in response().iter_items(checkpoint=checkpoint, max_pages=2)
+        ]
+        assert items == list(range(6))
+        assert checkpoint.load() == {
+            "method": "GET",
+            "request_kwargs": {"url": "https://api.test.com/test/?page=2"},
+            "pages": 2,
+            "items": 6,
+        }
+
+        # Limits include what was consumed before the checkpoint.
+        items = [
+            item async for item in client.test().resume_items(checkpoint, max_items=10)
+        ]
+        assert items == [6, 7, 8, 9]
+
+
+class SyncAdapter(BaseAdapter):
+    def get_watermark_request_kwargs(self, watermark, request_kwargs, **kwargs):
+        return {**request_kwargs, "params": {"since": watermark}}
+
+    def get_item_watermark(self, item, **kwargs):
+        return item["version"]
+
+
+SyncClient = generate_wrapper_from_adapter(SyncAdapter)
+
+
+def make_versioned_transport(versions):
+    transport = InMemoryTransport()
+
+    @transport.route("GET", r"/test/")
+    def changes(request):
+        since = int(request.params.get("since", -1))
+        return {"data": [{"version": v} for v in versions if v > since]}
+
+    return transport
+
+
+async def test_sync_items_fetches_only_changes():
+    versions = [3, 1, 2]
+    transport = make_versioned_transport(versions)
+    watermark = Watermark(MemoryStateStore(), "test")
+
+    async with SyncClient(session=transport) as client:
+        first = [item["version"] async for item in client.test().sync_items(watermark)]
+        assert first == [3, 1, 2]
+        assert watermark.store.get("test") == 3
+
+        versions.extend([5, 4])
+        second = [item["version"] async for item in client.test().sync_items(watermark)]
+        assert second == [5, 4]
+        assert watermark.store.get("test") == 5
+
+        third = [item async for item in client.test().sync_items(watermark)]
+        assert third == []
+        assert watermark.store.get("test") == 5
+
+
+async def test_unordered_watermark_is_stored_only_after_full_walk():
+    transport = make_versioned_transport([3, 1, 2])
+    watermark = Watermark(MemoryStateStore(), "test")
+
+    async with SyncClient(session=transport) as client:
+        async for item in client.test().sync_items(watermark):
+            if item["version"] == 1:
+                break
+
+    assert watermark.value == 3
+    assert watermark.store.get("test") is None
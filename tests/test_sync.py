@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from aioresponses import aioresponses
+
+from async_tapi.exceptions import ClientError
+from async_tapi.sync import SyncClient, SyncTAPIClient
+from tests.client import TesterClient
+
+
+@pytest.fixture
+def client():
+    with TesterClient.sync() as client:
+        yield client
+
+
+def test_sync_get(client):
+    with aioresponses() as mocked:
+        mocked.get(
+            client.test().data,
+            body='{"data": {"key": "value"}}',
+            status=200,
+            content_type="application/json",
+        )
+        response = client.test().get()
+
+    assert isinstance(response, SyncTAPIClient)
+    assert response.status == 200
+    assert response["data"] == {"key": "value"}
+
+
+def test_sync_post_batch(client):
+    data = [{"key": 1}, {"key": 2}]
+    with aioresponses() as mocked:
+        for _ in data:
+            mocked.post(
+                client.test().data,
+                body='{"ok": true}',
+                status=200,
+                content_type="application/json",
+            )
+        results = client.test().post_batch(data=data)
+
+    assert len(results) == 2
+    assert all(isinstance(result, SyncTAPIClient) for result in results)
+    assert all(result.data == {"ok": True} for result in results)
+    assert results.stats["succeeded"] == 2
+
+
+def test_sync_raises_client_error(client):
+    with aioresponses() as mocked:
+        mocked.get(client.test().data, status=400, content_type="application/json")
+        with pytest.raises(ClientError):
+            client.test().get()
+
+
+def test_sync_iter_items_with_prefetch(client):
+    next_url = "http://api.teste.com/next_batch"
+    with aioresponses() as mocked:
+        mocked.get(
+            client.test().data,
+            body='{"data": [1, 2], "paging": {"next": "%s"}}' % next_url,
+            status=200,
+            content_type="application/json",
+        )
+        mocked.get(
+            next_url,
+            body='{"data": [3], "paging": {"next": ""}}',
+            status=200,
+            content_type="application/json",
+        )
+        response = client.test().get()
+        items = list(response().iter_items(prefetch=1))
+
+    assert items == [1, 2, 3]
+
+
+def test_threads_share_one_session(client):
+    with aioresponses() as mocked:
+        for _ in range(8):
+            mocked.get(
+                client.test().data,
+                body="{}",
+                status=200,
+                content_type="application/json",
+            )
+        with ThreadPoolExecutor(4) as pool:
+            responses = list(pool.map(lambda _: client.test().get(), range(8)))
+
+    assert {r.status for r in responses} == {200}
+    sessions = {id(r._client._session) for r in responses}
+    assert len(sessions) == 1
+
+
+def test_close_stops_loop():
+    client = SyncClient(TesterClient)
+    loop = client._runner.loop
+    client.close()
+    assert loop.is_closed()
+    client.close()
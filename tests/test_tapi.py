@@ -1,10 +1,11 @@
 import pytest
 from aioresponses import aioresponses, CallbackResult
 
-from async_tapi.adapters import Resource
+from async_tapi.adapters import Resource, generate_wrapper_from_adapter
 from async_tapi.exceptions import ClientError, ServerError
+from async_tapi.transport import InMemoryTransport
 from tests.client import TesterClient
-
+from tests.client import TesterClientAdapter as BaseAdapter
 
 """
 tests TAPIClient
@@ -127,9 +128,26 @@ async def test_client_data_list():
     assert client[1] == 1
 
 
+async def test_resource_named_like_a_client_attribute():
+    class Adapter(BaseAdapter):
+        resource_mapping = {
+            **BaseAdapter.resource_mapping,
+            "stats": {"resource": "stats/", "docs": ""},
+        }
+
+    client = generate_wrapper_from_adapter(Adapter)()
+
+    assert client.stats().data == "https://api.test.com/stats/"
+    # Executors have no resources, there it is still the counters.
+    assert client.test().stats is client._stats
+    assert TesterClient().stats == {}
+
+
 async def test_fill_url_from_default_params():
     client = TesterClient(default_url_params={"id": 123})
     assert client.user().data == "https://api.test.com/user/123/"
+    assert client.user(id=1).data == "https://api.test.com/user/1/"
+    assert client.user().data == "https://api.test.com/user/123/"
 
 
 """
@@ -713,3 +731,119 @@ async def test_delete_batch():
                 assert response.data == data_row
 
             assert len(results) == len(data)
+
+
+"""
+tests lazy and status-only responses
+"""
+
+
+async def test_lazy_response_decodes_on_access():
+    async with TesterClient() as client:
+        with aioresponses() as mocked:
+            mocked.get(
+                client.test().data,
+                body='{"data": [1, 2]}',
+                status=200,
+                content_type="application/json",
+            )
+
+            response = await client.test().get(lazy=True)
+
+            assert response._data is None
+            assert response._content == b'{"data": [1, 2]}'
+            assert response["data"] == [1, 2]
+            assert response._content is None
+            assert response.data == {"data": [1, 2]}
+
+
+async def test_lazy_response_still_raises_on_errors():
+    async with TesterClient() as client:
+        with aioresponses() as mocked:
+            mocked.get(
+                client.test().data,
+                body='{"error": "bad request"}',
+                status=400,
+                content_type="application/json",
+            )
+
+            with pytest.raises(ClientError):
+                await client.test().get(lazy=True)
+
+
+async def test_status_only_delete_batch():
+    async with TesterClient() as client:
+        with aioresponses() as mocked:
+            for _ in range(2):
+                mocked.delete(
+                    client.test().data,
+                    body='{"data": "ignored"}',
+                    status=200,
+                    content_type="application/json",
+                )
+
+            results = await client.test().delete_batch(
+                data=[{"id": 1}, {"id": 2}], status_only=True
+            )
+
+            assert [response.status for response in results] == [200, 200]
+            assert [response.data for response in results] == [None, None]
+            assert "status_only" not in list(mocked.requests.values())[0][0].kwargs
+
+
+async def test_put_batch_dedup():
+    data = [{"id": 1}, {"id": 2}, {"id": 1}, {"id": 1}]
+    async with TesterClient() as client:
+        with aioresponses() as mocked:
+            for body in ('{"id": 1}', '{"id": 2}'):
+                mocked.put(
+                    client.test().data,
+                    body=body,
+                    status=200,
+                    content_type="application/json",
+                )
+
+            results = await client.test().put_batch(data=data, dedup=True)
+
+            assert [response.data for response in results] == data
+            assert results[0] is results[2] is results[3]
+            assert len(list(mocked.requests.values())[0]) == 2
+            assert client.stats["batch_deduplicated"] == 2
+
+
+class PackingAdapter(BaseAdapter):
+    pack_max_items = 3
+    pack_max_bytes = 40
+
+    def build_pack_envelope(self, rows, **kwargs):
+        return {"items": rows}
+
+    def split_pack_response(self, response_data, rows, **kwargs):
+        return response_data["results"]
+
+
+PackingClient = generate_wrapper_from_adapter(PackingAdapter)
+
+
+async def test_post_batch_pack():
+    transport = InMemoryTransport()
+    sizes = []
+
+    @transport.route("POST", r"/test/")
+    def create(request):
+        items = request.json()["items"]
+        sizes.append(len(items))
+        return {"results": [{"id": item["n"] * 10} for item in items]}
+
+    data = [{"n": n} for n in range(7)] + [{"n": 7, "name": "x" * 50}, {"n": 8}]
+    async with PackingClient(session=transport) as client:
+        results = await client.test().post_batch(data=data, pack=True)
+
+        assert [response.data for response in results] == [
+            {"id": n * 10} for n in range(9)
+        ]
+        assert results[0].status == 200
+        assert results[0].response is results[2].response
+        assert sizes == [3, 3, 1, 1, 1]
+        assert client.stats["batch_packed_requests"] == 5
+        assert client.stats["batch_packed_rows"] == 9
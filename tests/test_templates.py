@@ -0,0 +1,119 @@
+import pytest
+
+from async_tapi.adapters import generate_wrapper_from_adapter
+from async_tapi.templates import RequestTemplate
+from async_tapi.transport import InMemoryTransport
+from tests.client import TesterClient, TesterClientAdapter as BaseAdapter
+
+
+def make_transport(requests, statuses=None):
+    def handler(request):
+        requests.append(request)
+        status = statuses.pop(0) if statuses else 200
+        return status, {"data": []}
+
+    return InMemoryTransport(handler=handler)
+
+
+def test_template_is_immutable():
+    headers = {"Authorization": "token"}
+    template = RequestTemplate(url="https://api.test.com/test/", headers=headers)
+    headers["Authorization"] = "changed"
+
+    assert template.headers == {"Authorization": "token"}
+    with pytest.raises(TypeError):
+        template.headers["Authorization"] = "changed"
+    with pytest.raises(AttributeError):
+        template.url = "https://api.another.com/"
+
+    kwargs = template.apply({"headers": {"X-Call": "1"}, "params": {"a": 1}})
+    assert kwargs == {
+        "headers": {"Authorization": "token", "X-Call": "1"},
+        "params": {"a": 1},
+    }
+    assert template.headers == {"Authorization": "token"}
+
+
+async def test_template_is_built_once_per_resource():
+    calls = []
+
+    class Adapter(BaseAdapter):
+        def get_request_template(self, api_params, resource_name):
+            calls.append(resource_name)
+            return super().get_request_template(api_params, resource_name)
+
+    requests = []
+    Client = generate_wrapper_from_adapter(Adapter)
+    async with Client(
+        session=make_transport(requests),
+        headers={"Authorization": "token"},
+        default_params={"lang": "en"},
+    ) as client:
+        for _ in range(3):
+            await client.test().get(params={"page": 2}, headers={"X-Call": "1"})
+        await client.user(id=1).get()
+        await client.another_root().get()
+
+    assert calls == ["test", "user", "another_root"]
+    assert requests[0].url == "https://api.test.com/test/"
+    assert requests[0].params == {"lang": "en", "page": 2}
+    assert requests[0].headers == {
+        "Content-Type": "application/json",
+        "Authorization": "token",
+        "X-Call": "1",
+    }
+    assert requests[3].url == "https://api.test.com/user/1/"
+    assert requests[3].params == {"lang": "en"}
+    assert requests[4].url == "https://api.another.com/another-root/"
+
+
+async def test_template_is_rebuilt_after_token_refresh():
+    class Adapter(BaseAdapter):
+        def is_authentication_expired(self, exception, *args, **kwargs):
+            return exception.status == 401
+
+        def refresh_authentication(self, api_params, *args, **kwargs):
+            api_params["headers"] = {"Authorization": "new"}
+            return "new"
+
+    requests = []
+    Client = generate_wrapper_from_adapter(Adapter)
+    async with Client(
+        session=make_transport(requests, [401]),
+        headers={"Authorization": "old"},
+        refresh_token_by_default=True,
+    ) as client:
+        await client.test().get()
+
+        assert [r.headers["Authorization"] for r in requests] == ["old", "new"]
+
+        client._api_params["headers"] = {"Authorization": "manual"}
+        await client.test().get()
+        client.reset_request_templates()
+        await client.test().get()
+
+    assert [r.headers["Authorization"] for r in requests[2:]] == ["new", "manual"]
+
+
+async def test_adapter_without_template():
+    adapter = BaseAdapter()
+    kwargs = adapter.get_request_kwargs(
+        {"headers": {"Authorization": "token"}}, "GET", url="https://api.test.com/"
+    )
+
+    assert kwargs["headers"] == {
+        "Content-Type": "application/json",
+        "Authorization": "token",
+    }
+    assert TesterClient()._request_template("missing").url is None
+
+
+def test_resource_named_reset_request_templates():
+    class Adapter(BaseAdapter):
+        resource_mapping = {
+            **BaseAdapter.resource_mapping,
+            "reset_request_templates": {"resource": "reset/", "docs": ""},
+        }
+
+    client = generate_wrapper_from_adapter(Adapter)()
+    assert client.reset_request_templates().data == "https://api.test.com/reset/"
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from async_tapi.adapters import Resource, generate_wrapper_from_adapter
+from async_tapi.exceptions import ServerError
+from async_tapi.scheduling import RequestScheduler
+from async_tapi.timeouts import AdaptiveTimeout, client_timeout
+from async_tapi.transport import InMemoryTransport
+from tests.client import TesterClient
+from tests.client import TesterClientAdapter as BaseAdapter
+
+
+class RetryingAdapter(BaseAdapter):
+    def retry_request(self, tapi_exception, error_message, repeat_number, **kwargs):
+        return True
+
+
+RetryingClient = generate_wrapper_from_adapter(RetryingAdapter)
+
+
+def test_client_timeout():
+    assert client_timeout(None) is None
+    assert client_timeout(5).total == 5
+    assert client_timeout(5, remaining=2).total == 2
+    assert client_timeout(None, remaining=2).total == 2
+
+    timeout = client_timeout(aiohttp.ClientTimeout(total=None, connect=3), remaining=2)
+    assert (timeout.total, timeout.connect) == (2, 3)
+
+
+def test_adaptive_timeout():
+    timeout = AdaptiveTimeout(
+        percentile=90, multiplier=2, min_timeout=0.5, max_timeout=10, min_samples=10
+    )
+    assert timeout.get("test") == 10
+
+    for latency in range(1, 11):
+        timeout.observe("test", latency / 10)
+    assert timeout.get("test") == pytest.approx(1.8)
+    assert timeout.get("user") == 10
+
+    timeout.observe("fast", 0.001)
+    timeout.min_samples = 1
+    assert timeout.get("fast") == 0.5
+
+
+async def test_timeout_levels():
+    transport = InMemoryTransport(handler=lambda request: {}, latency=0.05)
+    resource_mapping = [Resource("slow", "https://api.test.com/slow/", timeout=1)]
+
+    async with TesterClient(
+        session=transport, timeout=0.01, resource_mapping=resource_mapping
+    ) as client:
+        with pytest.raises(asyncio.TimeoutError):
+            await client.test().get()
+        assert client.stats["timeouts"] == 1
+
+        # The resource timeout wins over the client one, the call over both.
+        await client.slow().get()
+        await client.test().get(timeout=1)
+        with pytest.raises(asyncio.TimeoutError):
+            await client.slow().get(timeout=0.01)
+
+
+async def test_deadline_spans_retries():
+    transport = InMemoryTransport(handler=lambda request: (500, ""), latency=0.02)
+
+    async with RetryingClient(session=transport) as client:
+        start = time.monotonic()
+        # Either the last error or the deadline cutting the last attempt.
+        with pytest.raises((ServerError, asyncio.TimeoutError)):
+            await client.test().get(deadline=0.1)
+        elapsed = time.monotonic() - start
+
+    assert 3 <= transport.requests <= 6
+    assert elapsed < 0.2
+
+
+async def test_deadline_caps_request_timeout():
+    transport = InMemoryTransport(handler=lambda request: {}, latency=0.2)
+
+    async with TesterClient(session=transport, timeout=10) as client:
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.test().get(deadline=0.05)
+
+    assert time.monotonic() - start < 0.15
+
+
+async def test_deadline_covers_waiting_for_a_slot():
+    transport = InMemoryTransport(handler=lambda request: {}, latency=0.3)
+
+    for options in ({"concurrency": 1}, {"scheduler": RequestScheduler(1)}):
+        async with TesterClient(session=transport, **options) as client:
+            busy = asyncio.ensure_future(client.test().get())
+            await asyncio.sleep(0.01)
+
+            start = time.monotonic()
+            with pytest.raises(asyncio.TimeoutError):
+                await client.test().get(deadline=0.1)
+            assert time.monotonic() - start < 0.15, options
+
+            await busy
+            # The slot given up on is not leaked.
+            await client.test().get(deadline=1)
+
+
+async def test_adaptive_timeout_learns_latency():
+    latency = {"value": 0.01}
+    transport = InMemoryTransport(
+        handler=lambda request: {}, latency=lambda request: latency["value"]
+    )
+    timeout = AdaptiveTimeout(multiplier=3, min_timeout=0.01, min_samples=5)
+
+    async with TesterClient(session=transport, timeout=timeout) as client:
+        for _ in range(5):
+            await client.test().get()
+        assert timeout.get("test") < 0.1
+
+        latency["value"] = 0.5
+        with pytest.raises(asyncio.TimeoutError):
+            await client.test().get()
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from async_tapi.exceptions import NotFound404Error, ServerError
+from async_tapi.transport import InMemoryResponse, InMemoryTransport
+from tests.client import TesterClient
+
+
+@pytest.fixture
+def transport():
+    transport = InMemoryTransport()
+
+    @transport.route("GET", r"/user/(?P<id>\d+)/")
+    def user(request):
+        return {"id": int(request.match["id"]), "fields": request.params.get("fields")}
+
+    @transport.route("POST", r"/test/")
+    async def echo(request):
+        return 201, request.json()
+
+    @transport.route("GET", r"/test/")
+    def text(request):
+        return InMemoryResponse(
+            "GET", request.url, body="plain", content_type="text/plain"
+        )
+
+    return transport
+
+
+async def test_routes_requests_to_handlers(transport):
+    async with TesterClient(session=transport) as client:
+        response = await client.user(id=7).get(params={"fields": "name"})
+        assert response.data == {"id": 7, "fields": "name"}
+
+        response = await client.test().post(data={"key": "value"})
+        assert response.status == 201
+        assert response.data == {"key": "value"}
+
+        response = await client.test().get()
+        assert response.data == "plain"
+
+    assert transport.requests == 3
+
+
+async def test_unknown_route_is_404(transport):
+    async with TesterClient(session=transport) as client:
+        with pytest.raises(NotFound404Error):
+            await client.another_root().get()
+
+
+async def test_faults_are_injected_in_order():
+    transport = InMemoryTransport(
+        handler=lambda request: {"ok": True},
+        faults=[None, (503, ""), asyncio.TimeoutError()],
+    )
+    async with TesterClient(session=transport) as client:
+        response = await client.test().get()
+        assert response.data == {"ok": True}
+
+        with pytest.raises(ServerError):
+            await client.test().get()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await client.test().get()
+
+        response = await client.test().get()
+        assert response.data == {"ok": True}
+
+
+async def test_latency_is_applied_per_request():
+    transport = InMemoryTransport(handler=lambda request: {}, latency=0.01)
+    async with TesterClient(session=transport) as client:
+        await asyncio.gather(*[client.test().get() for _ in range(5)])
+
+    assert transport.max_in_flight == 5
+
+
+async def test_pagination_over_transport():
+    transport = InMemoryTransport()
+    next_url = "https://api.test.com/test/?page=2"
+
+    @transport.route("GET", r"page=2")
+    def second(request):
+        return {"data": [3], "paging": {"next": ""}}
+
+    @transport.route("GET", r"/test/")
+    def first(request):
+        return {"data": [1, 2], "paging": {"next": next_url}}
+
+    async with TesterClient(session=transport) as client:
+        response = await client.test().get()
+        items = [item async for item in response().iter_items()]
+
+    assert items == [1, 2, 3]